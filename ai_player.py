@@ -0,0 +1,106 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from board import drop_piece, get_next_open_row, is_valid_location, winning_move_at
+from minimaxAI import iterative_deepening, table_move
+from solver import perfect_move
+
+AI_TIME_LIMIT = 2.0
+# share of a move's time limit the exact solver may use before falling back
+# to iterative deepening
+SOLVER_TIME_SHARE = 0.5
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ai-search")
+
+def choose_move(board, piece, depth, heuristic_type="original", perfect_play=False, book=None, time_limit=AI_TIME_LIMIT, stop_event=None, eval_cache=None, tt=None):
+    # the solver and the search share one time budget
+    start = time.time()
+    if perfect_play:
+        perfect = perfect_move(board, piece, book, stop_event=stop_event, deadline=start + time_limit * SOLVER_TIME_SHARE)
+        if perfect is not None:
+            return perfect[0]
+    time_left = max(start + time_limit - time.time(), 0.0)
+    col, _ = iterative_deepening(board, piece, depth, time_limit=time_left, heuristic_type=heuristic_type, stop_event=stop_event,
+                                 eval_cache=eval_cache, tt=tt)
+    return col
+
+class BackgroundMove:
+    # choose_move on the search thread. The search checks stop_event at every
+    # node, so cancel() returns control within one node of work.
+    def __init__(self, board, piece, depth, **kwargs):
+        self.stop_event = threading.Event()
+        board = [list(row) for row in board]
+        self.future = _executor.submit(choose_move, board, piece, depth, stop_event=self.stop_event, **kwargs)
+
+    def done(self):
+        return self.future.done()
+
+    def result(self):
+        return self.future.result()
+
+    def cancel(self):
+        self.stop_event.set()
+        self.future.cancel()
+
+class ReadyMove:
+    # a move that is already known, behind BackgroundMove's interface
+    def __init__(self, col):
+        self.col = col
+
+    def done(self):
+        return True
+
+    def result(self):
+        return self.col
+
+    def cancel(self):
+        pass
+
+def ponder_order(board, predicted=None):
+    # the opponent's predicted move first, then the rest centre-first
+    centre = (len(board[0]) - 1) / 2
+    cols = sorted((c for c in range(len(board[0])) if is_valid_location(board, c)), key=lambda c: abs(c - centre))
+    if predicted in cols:
+        cols.remove(predicted)
+        cols.insert(0, predicted)
+    return cols
+
+class Ponder:
+    # Searches piece's replies to each of the opponent's moves while the
+    # opponent thinks, most likely move first (the table's best move for the
+    # opponent), with the same choose_move arguments the real move will use.
+    # Finished replies are kept by the opponent's column, and every search
+    # leaves its entries in tt, so the real search after an unexpected move
+    # still starts warm. Runs on the search thread, so a BackgroundMove
+    # started after reply() or cancel() waits at most one node for it.
+    def __init__(self, board, piece, depth, tt, **kwargs):
+        self.stop_event = threading.Event()
+        self.replies = {}
+        board = [list(row) for row in board]
+        self.future = _executor.submit(self.run, board, piece, depth, tt, kwargs)
+
+    def run(self, board, piece, depth, tt, kwargs):
+        opponent = 2 if piece == 1 else 1
+        predicted = table_move(board, piece, False, kwargs.get("heuristic_type", "original"), tt)
+        for col in ponder_order(board, predicted):
+            if self.stop_event.is_set():
+                return
+            child = [list(row) for row in board]
+            row = get_next_open_row(child, col)
+            drop_piece(child, row, col, opponent)
+            if winning_move_at(child, row, col, opponent):
+                continue
+            move = choose_move(child, piece, depth, stop_event=self.stop_event, tt=tt, **kwargs)
+            # a search cut short by stop_event only has a partial answer
+            if not self.stop_event.is_set():
+                self.replies[col] = move
+
+    def reply(self, col):
+        # stops pondering; the finished reply to col, or None
+        self.cancel()
+        return self.replies.get(col)
+
+    def cancel(self):
+        self.stop_event.set()
+        self.future.cancel()
@@ -0,0 +1,75 @@
+import threading
+import time
+
+import pygame
+
+# Every image, sound and font goes through here so each file is decoded once.
+# Images are cached per target size; a failed load is cached as None so it is
+# reported once and the caller falls back.
+_images = {}
+_sounds = {}
+_fonts = {}
+load_times = {}
+_sound_lock = threading.Lock()
+
+def _timed_load(name, loader):
+    start = time.perf_counter()
+    try:
+        return loader()
+    finally:
+        load_times[name] = load_times.get(name, 0.0) + time.perf_counter() - start
+
+def image(path, size=None):
+    key = (path, size)
+    if key not in _images:
+        if (path, None) not in _images:
+            try:
+                _images[(path, None)] = _timed_load(path, lambda: pygame.image.load(path).convert())
+            except (pygame.error, FileNotFoundError) as e:
+                print(f"Error loading {path}: {e}.")
+                _images[(path, None)] = None
+        original = _images[(path, None)]
+        if size is not None:
+            _images[key] = None if original is None else _timed_load(f"{path} @ {size[0]}x{size[1]}", lambda: pygame.transform.scale(original, size))
+    return _images[key]
+
+def sound(path):
+    # decoded on first use unless preload_sounds already got to it
+    with _sound_lock:
+        if path not in _sounds:
+            try:
+                _sounds[path] = _timed_load(path, lambda: pygame.mixer.Sound(path))
+            except (pygame.error, FileNotFoundError) as e:
+                print(f"Error loading {path}: {e}. Sound effect disabled.")
+                _sounds[path] = None
+        return _sounds[path]
+
+def play_sound(path):
+    effect = sound(path)
+    if effect is not None:
+        effect.play()
+
+def preload_sounds(paths):
+    # decode in the background so the first play does not stall a frame
+    thread = threading.Thread(target=lambda: [sound(path) for path in paths], name="asset-preload", daemon=True)
+    thread.start()
+    return thread
+
+def font(path, size, fallback="sans"):
+    key = (path, size)
+    if key not in _fonts:
+        try:
+            _fonts[key] = _timed_load(f"{path} @ {size}", lambda: pygame.font.Font(path, size))
+        except (pygame.error, FileNotFoundError):
+            print(f"Font {path} not found, using '{fallback}' fallback.")
+            _fonts[key] = pygame.font.SysFont(fallback, size)
+    return _fonts[key]
+
+def sys_font(name, size):
+    key = (None, name, size)
+    if key not in _fonts:
+        _fonts[key] = _timed_load(f"{name} @ {size}", lambda: pygame.font.SysFont(name, size))
+    return _fonts[key]
+
+def load_report():
+    return sorted(load_times.items(), key=lambda item: -item[1])
@@ -0,0 +1,110 @@
+import numpy as np
+
+from evaluator import window_scores
+from minimaxAI import (HEURISTIC1_GOOD_THREAT, HEURISTIC1_IMMEDIATE, HEURISTIC1_LIMIT, HEURISTIC1_LINE,
+                       HEURISTIC1_THREAT, HEURISTIC1_UNSTOPPABLE, heuristic1_column_weights)
+from threats import geometry, threat_squares
+from windows import VERTICAL, window_table
+
+_index_tables = {}
+
+def as_batch(boards):
+    return np.asarray(boards, dtype=np.int8)
+
+def index_tables(rows, cols, k=4):
+    tables = _index_tables.get((rows, cols, k))
+    if tables is not None:
+        return tables
+    table = window_table(rows, cols, k)
+    cells = np.array([[r * cols + c for r, c in window] for window in table.windows], dtype=np.intp)
+    edge_vertical = np.array([d == VERTICAL and window[0][1] in (0, cols - 1)
+                              for d, window in zip(table.directions, table.windows)])
+    edge_column = np.array([window[0][1] == 0 for window in table.windows])
+
+    tables = {
+        "cells": cells,
+        "edge_vertical": edge_vertical,
+        "edge_column": edge_column,
+    }
+    _index_tables[(rows, cols, k)] = tables
+    return tables
+
+def evaluate_position_batch(boards, piece, k=4):
+    boards = as_batch(boards)
+    n, rows, cols = boards.shape
+    opponent = 2 if piece == 1 else 1
+    tables = index_tables(rows, cols, k)
+    flat = boards.reshape(n, -1)
+    windows = flat[:, tables["cells"]]
+    own = (windows == piece).sum(axis=2)
+    opp = (windows == opponent).sum(axis=2)
+
+    scores = np.asarray(window_scores(k), dtype=np.int64)[own, opp].sum(axis=1)
+    scores += (boards[:, :, cols // 2] == piece).sum(axis=1) * 6
+    scores -= (boards[:, :, 0] == piece).sum(axis=1)
+    scores -= (boards[:, :, cols - 1] == piece).sum(axis=1)
+
+    threats = (opp == k - 1) & (own == 0) & tables["edge_vertical"]
+    left_threat = (threats & tables["edge_column"]).any(axis=1)
+    right_threat = (threats & ~tables["edge_column"]).any(axis=1)
+    scores -= 150 * left_threat + 150 * right_threat
+    return scores
+
+def evaluate_heuristic2_batch(boards, piece, opponent, k=4):
+    boards = as_batch(boards)
+    n, rows, cols = boards.shape
+    signs = (boards == piece).astype(np.int64) - (boards == opponent).astype(np.int64)
+    value_matrix = window_table(rows, cols, k).value_matrix
+    return signs.reshape(n, -1) @ np.asarray(value_matrix, dtype=np.int64).reshape(-1)
+
+def bitboard_weights(rows, cols):
+    # uint64 bit of each cell in the bitboard layout
+    stride = rows + 1
+    return np.array([[1 << (c * stride + r) for c in range(cols)] for r in range(rows)], dtype=np.uint64)
+
+def popcount_batch(masks):
+    return np.unpackbits(masks.astype("<u8").view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1).astype(np.int64)
+
+def has_run_batch(masks, stride, k):
+    found = np.zeros(masks.shape, dtype=bool)
+    for shift in (1, stride, stride + 1, stride - 1):
+        run = masks
+        for i in range(1, k):
+            run = run & (masks >> np.uint64(i * shift))
+        found |= run != 0
+    return found
+
+def evaluate_heuristic1_batch(boards, piece, opponent, k=4):
+    # the scalar version's threat terms on an array of uint64 masks, one per
+    # board, so boards need (rows + 1) * cols <= 64
+    boards = as_batch(boards)
+    n, rows, cols = boards.shape
+    if (rows + 1) * cols > 64:
+        raise ValueError(f"{rows}x{cols} boards do not fit in a 64-bit mask")
+    bits = bitboard_weights(rows, cols)
+    masks = {player: np.where(boards == player, bits, np.uint64(0)).reshape(n, -1).sum(axis=1, dtype=np.uint64)
+             for player in (piece, opponent)}
+    bottom, full, odd = geometry(rows, cols)
+    occupied = masks[piece] | masks[opponent]
+    playable = (occupied + np.uint64(bottom)) & np.uint64(full)
+
+    scores = np.zeros(n, dtype=np.int64)
+    for player, sign in ((piece, 1), (opponent, -1)):
+        threats = threat_squares(masks[player], occupied, rows, cols, k)
+        immediate = threats & playable
+        parity = odd if player == 1 else full & ~odd
+        good = threats & np.uint64(parity) & ~playable
+        immediate_count = popcount_batch(immediate)
+        good_count = popcount_batch(good)
+        later_count = popcount_batch(threats) - immediate_count - good_count
+        stacked = threats & (threats >> np.uint64(1)) & playable
+        line = has_run_batch(masks[player], rows + 1, k)
+        unstoppable = ~line & ((immediate_count > 1) | (stacked != 0))
+        scores += sign * (line * HEURISTIC1_LINE + unstoppable * HEURISTIC1_UNSTOPPABLE
+                          + immediate_count * HEURISTIC1_IMMEDIATE + good_count * HEURISTIC1_GOOD_THREAT
+                          + later_count * HEURISTIC1_THREAT)
+
+    weights = np.asarray(heuristic1_column_weights(cols), dtype=np.int64)
+    column_balance = (boards == piece).sum(axis=1) - (boards == opponent).sum(axis=1)
+    scores += column_balance @ weights
+    return np.clip(scores, -HEURISTIC1_LIMIT, HEURISTIC1_LIMIT)
@@ -0,0 +1,525 @@
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from bitboard import Board
+from board import create_board, drop_piece, get_next_open_row, is_valid_location, winning_move, winning_move_at
+from gamerecord import board_from_moves
+
+def random_positions(count, seed=0, rows=6, cols=7, k=4):
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        board = create_board(rows, cols)
+        piece = 1
+        for _ in range(rng.randint(0, rows * cols)):
+            valid = [c for c in range(cols) if is_valid_location(board, c)]
+            if not valid:
+                break
+            col = rng.choice(valid)
+            drop_piece(board, get_next_open_row(board, col), col, piece)
+            if winning_move(board, piece, k):
+                break
+            piece = 3 - piece
+        positions.append(board)
+    return positions
+
+# Fixed search corpus: 0-based columns played alternately, player 1 first.
+SEARCH_CORPUS = {
+    "empty": "",
+    "opening": "1332",
+    "early": "65421243",
+    "middlegame": "3664002640653",
+    "crowded": "436225023342213201",
+    "late": "62033556604160343063125",
+}
+HEURISTICS = ("original", "heuristic1", "heuristic2")
+# cases faster than this are too noisy to flag as time regressions
+MIN_TIMED_SECONDS = 0.25
+# what --save-baseline keeps of each case: the metrics that come out the
+# same on every machine, so the baseline can be committed
+BASELINE_FIELDS = ("position", "moves", "heuristic", "depth", "move", "score", "nodes")
+
+def playable_positions(count, seed=0):
+    positions = []
+    for board in random_positions(count * 10, seed):
+        if len(positions) == count:
+            break
+        if not winning_move(board, 1) and not winning_move(board, 2) and 0 in board[-1]:
+            positions.append(board)
+    return positions
+
+def time_calls(func, boards, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for board in boards:
+            func(board, 1)
+            func(board, 2)
+    return (time.perf_counter() - start) / (repeat * len(boards) * 2)
+
+def bench_wincheck(count, repeat, rows=6, cols=7, k=4):
+    lists = random_positions(count, rows=rows, cols=cols, k=k)
+    bitboards = [Board.from_list(board) for board in lists]
+    list_time = time_calls(lambda board, piece: winning_move(board, piece, k), lists, repeat)
+    bitboard_time = time_calls(lambda board, piece: winning_move(board, piece, k), bitboards, repeat)
+
+    # the top piece of a random column stands in for the last move played
+    rng = random.Random(0)
+    cells = []
+    for board in lists:
+        filled = [c for c in range(cols) if board[0][c] != 0]
+        col = rng.choice(filled) if filled else 0
+        row = get_next_open_row(board, col)
+        row = rows - 1 if row == -1 else max(row - 1, 0)
+        cells.append((row, col, board[row][col]))
+
+    def time_local(boards):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for board, (row, col, piece) in zip(boards, cells):
+                winning_move_at(board, row, col, piece, k)
+        return (time.perf_counter() - start) / (repeat * len(boards))
+
+    list_local = time_local(lists)
+    bitboard_local = time_local(bitboards)
+    print(f"{rows}x{cols}, connect {k}")
+    print(f"list board, full scan:     {list_time * 1e6:8.2f} us/call")
+    print(f"bitboard, full scan:       {bitboard_time * 1e6:8.2f} us/call")
+    print(f"list board, last move:     {list_local * 1e6:8.2f} us/call")
+    print(f"bitboard, last move:       {bitboard_local * 1e6:8.2f} us/call")
+    print(f"speedup over list scan:    {list_time / bitboard_time:6.1f}x bitboard, {list_time / list_local:6.1f}x last move")
+
+def bench_evaluators(count, repeat, rows=6, cols=7, k=4):
+    from minimaxAI import evaluate_heuristic1, evaluate_heuristic2, evaluate_position
+
+    boards = random_positions(count, rows=rows, cols=cols, k=k)
+    cases = [
+        ("original", lambda board, piece: evaluate_position(board, piece, k)),
+        ("heuristic1", lambda board, piece: evaluate_heuristic1(board, piece, 3 - piece, k)),
+        ("heuristic2", lambda board, piece: evaluate_heuristic2(board, piece, 3 - piece, k)),
+        ("winning_move", lambda board, piece: winning_move(board, piece, k)),
+    ]
+    print(f"{rows}x{cols}, connect {k}, {count} positions")
+    for name, func in cases:
+        seconds = time_calls(func, boards, repeat)
+        # peak memory in use during one call, once the per-shape tables exist
+        tracemalloc.start()
+        peak = 0
+        for board in boards:
+            # clearing the traces also resets the peak (reset_peak needs 3.9)
+            tracemalloc.clear_traces()
+            func(board, 1)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        print(f"  {name:<14} {seconds * 1e6:8.2f} us/call  {peak:6d} bytes peak allocation")
+
+def bench_batch(count):
+    import batch_eval
+    from minimaxAI import evaluate_position, evaluate_heuristic1, evaluate_heuristic2
+
+    boards = random_positions(count)
+    array = batch_eval.as_batch(boards)
+    cases = [
+        ("original", lambda b: evaluate_position(b, 1), lambda a: batch_eval.evaluate_position_batch(a, 1)),
+        ("heuristic1", lambda b: evaluate_heuristic1(b, 1, 2), lambda a: batch_eval.evaluate_heuristic1_batch(a, 1, 2)),
+        ("heuristic2", lambda b: evaluate_heuristic2(b, 1, 2), lambda a: batch_eval.evaluate_heuristic2_batch(a, 1, 2)),
+    ]
+    for name, scalar, batch in cases:
+        start = time.perf_counter()
+        for board in boards:
+            scalar(board)
+        scalar_time = time.perf_counter() - start
+        start = time.perf_counter()
+        batch(array)
+        batch_time = time.perf_counter() - start
+        print(f"{name:<11} scalar {scalar_time * 1e3:8.1f} ms  batch {batch_time * 1e3:8.1f} ms  ({scalar_time / batch_time:.1f}x)")
+
+def bench_parallel(depth, workers, count):
+    import math
+    from evaluator import IncrementalEvaluator
+    from minimaxAI import minimax
+    from parallel import ParallelSearch
+    from transposition import TranspositionTable
+
+    boards = [create_board()] + playable_positions(count - 1, seed=1)
+
+    with ParallelSearch(workers) as search:
+        search.search(boards[0], 1, 2)  # start the worker processes
+        sequential_time = parallel_time = 0.0
+        for board in boards:
+            start = time.perf_counter()
+            expected = minimax([row[:] for row in board], depth, -math.inf, math.inf, True, 2, time.time(), math.inf,
+                               "original", tt=TranspositionTable(), evaluator=IncrementalEvaluator(board, 2))
+            sequential_time += time.perf_counter() - start
+            start = time.perf_counter()
+            result = search.search(board, depth, 2)
+            parallel_time += time.perf_counter() - start
+            if result != expected:
+                print(f"mismatch: sequential {expected}, parallel {result}")
+    print(f"depth {depth}, {len(boards)} positions, {search.workers} workers")
+    print(f"sequential: {sequential_time:8.2f} s")
+    print(f"parallel:   {parallel_time:8.2f} s")
+    print(f"speedup:    {sequential_time / parallel_time:8.2f}x")
+
+ORDERING_CONFIGS = [
+    (),
+    ("center",),
+    ("tt",),
+    ("center", "tt"),
+    ("center", "tt", "killer"),
+    ("center", "tt", "history"),
+    ("center", "tt", "killer", "history"),
+]
+
+def bench_ordering(depths, count, heuristic_type):
+    from minimaxAI import iterative_deepening
+    from move_ordering import MoveOrdering
+
+    boards = [create_board()] + playable_positions(count - 1, seed=2)
+    for depth in depths:
+        print(f"depth {depth}, {len(boards)} positions, {heuristic_type}")
+        baseline_nodes = None
+        for strategies in ORDERING_CONFIGS:
+            nodes = 0
+            cutoffs = first_cutoffs = 0
+            start = time.perf_counter()
+            for i, board in enumerate(boards):
+                ordering = MoveOrdering(strategies)
+                info = {}
+                iterative_deepening(board, 1 + i % 2, depth, heuristic_type=heuristic_type, ordering=ordering, info=info)
+                nodes += info["nodes"]
+                cutoffs += ordering.cutoffs
+                first_cutoffs += ordering.first_move_cutoffs
+            elapsed = time.perf_counter() - start
+            if baseline_nodes is None:
+                baseline_nodes = nodes
+            name = "+".join(strategies) or "none"
+            first_rate = first_cutoffs / cutoffs if cutoffs else 0.0
+            print(f"  {name:<28} {nodes:>10} nodes  {100 * (1 - nodes / baseline_nodes):6.1f}% pruned vs none"
+                  f"  first-move cutoffs {100 * first_rate:5.1f}%  {elapsed:7.2f} s")
+
+# (pvs, aspiration); the first is plain alpha-beta with a full window
+PVS_CONFIGS = [(False, False), (True, False), (True, True)]
+
+def bench_pvs(depths, count, heuristics):
+    from minimaxAI import iterative_deepening
+    from search_stats import SearchStats
+
+    boards = [create_board()] + playable_positions(count - 1, seed=3)
+    for heuristic_type in heuristics:
+        for depth in depths:
+            print(f"depth {depth}, {len(boards)} positions, {heuristic_type}")
+            baseline_nodes = baseline_scores = None
+            for pvs, aspiration in PVS_CONFIGS:
+                nodes = researches = 0
+                scores = []
+                start = time.perf_counter()
+                for i, board in enumerate(boards):
+                    stats = SearchStats()
+                    info = {}
+                    _, score = iterative_deepening(board, 1 + i % 2, depth, heuristic_type=heuristic_type, info=info,
+                                                   stats=stats, pvs=pvs, aspiration=aspiration)
+                    nodes += info["nodes"]
+                    researches += stats.researches + stats.aspiration_researches
+                    scores.append(score)
+                elapsed = time.perf_counter() - start
+                if baseline_nodes is None:
+                    baseline_nodes, baseline_scores = nodes, scores
+                name = "pvs" if pvs else "alpha-beta"
+                if aspiration:
+                    name += "+aspiration"
+                same = "same scores" if scores == baseline_scores else "SCORES DIFFER"
+                print(f"  {name:<22} {nodes:>10} nodes  {100 * (nodes / baseline_nodes - 1):+6.1f}% vs alpha-beta"
+                      f"  {researches:>6} re-searches  {elapsed:7.2f} s  {same}")
+
+def self_play(heuristic_type, depth, plies, eval_cache):
+    from minimaxAI import iterative_deepening
+    from search_stats import SearchStats
+
+    board = create_board()
+    stats = SearchStats()
+    moves = []
+    piece = 1
+    for _ in range(plies):
+        col, _ = iterative_deepening(board, piece, depth, heuristic_type=heuristic_type, stats=stats, eval_cache=eval_cache)
+        row = get_next_open_row(board, col)
+        drop_piece(board, row, col, piece)
+        moves.append(col)
+        if winning_move_at(board, row, col, piece):
+            break
+        piece = 3 - piece
+    return moves, stats
+
+def bench_evalcache(depth, plies, heuristics, size_mb):
+    from evalcache import EvalCache
+
+    for heuristic_type in heuristics:
+        start = time.perf_counter()
+        moves, stats = self_play(heuristic_type, depth, plies, None)
+        plain = time.perf_counter() - start
+        cache = EvalCache(size_mb=size_mb)
+        start = time.perf_counter()
+        cached_moves, cached_stats = self_play(heuristic_type, depth, plies, cache)
+        cached = time.perf_counter() - start
+        evals = sum(stats.eval_calls.values())
+        cached_evals = sum(cached_stats.eval_calls.values())
+        same = "same moves" if cached_moves == moves else "MOVES DIFFER"
+        print(f"{heuristic_type:<10} d{depth} {len(moves)} plies  evals {evals:>8} -> {cached_evals:>8}"
+              f"  hit rate {cached_stats.eval_cache_hit_rate():6.1%}  {len(cache):>7} entries {cache.evictions:>7} evicted"
+              f"  {plain:7.2f} s -> {cached:7.2f} s  {same}")
+
+def run_search_case(moves, heuristic_type, depth, measure_memory):
+    from minimaxAI import iterative_deepening
+
+    board, piece = board_from_moves(moves)
+    info = {}
+    start = time.perf_counter()
+    col, score = iterative_deepening(board, piece, depth, heuristic_type=heuristic_type, info=info)
+    elapsed = time.perf_counter() - start
+
+    peak_kb = None
+    if measure_memory:
+        # a second, traced run: tracemalloc slows the search down too much
+        # to time it in the same pass
+        tracemalloc.start()
+        iterative_deepening(board, piece, depth, heuristic_type=heuristic_type)
+        peak_kb = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+
+    return {
+        "move": col,
+        "score": score,
+        "nodes": info["nodes"],
+        "time": elapsed,
+        "nps": info["nodes"] / elapsed if elapsed else 0.0,
+        "peak_kb": peak_kb,
+    }
+
+def compare_to_baseline(results, baseline, threshold):
+    previous = {(r["position"], r["heuristic"], r["depth"]): r for r in baseline["results"]}
+    problems = []
+    for result in results:
+        old = previous.get((result["position"], result["heuristic"], result["depth"]))
+        if old is None:
+            continue
+        name = f'{result["position"]}/{result["heuristic"]}/d{result["depth"]}'
+        for metric in ("nodes", "time", "peak_kb"):
+            if metric == "time" and old.get("time", 0) < MIN_TIMED_SECONDS:
+                continue
+            if old.get(metric) and result.get(metric) and result[metric] > old[metric] * (1 + threshold):
+                problems.append(f"{name}: {metric} {old[metric]:.6g} -> {result[metric]:.6g}")
+        for metric in ("move", "score"):
+            if metric in old and result[metric] != old[metric]:
+                problems.append(f'{name}: {metric} {old[metric]} -> {result[metric]}')
+    return problems
+
+def bench_search(depths, heuristics, output, baseline_path, save_baseline, threshold, measure_memory):
+    results = []
+    for name, moves in SEARCH_CORPUS.items():
+        for heuristic_type in heuristics:
+            for depth in depths:
+                result = run_search_case(moves, heuristic_type, depth, measure_memory)
+                result.update(position=name, moves=moves, heuristic=heuristic_type, depth=depth)
+                results.append(result)
+                peak = f'{result["peak_kb"]:9.0f} KB' if result["peak_kb"] is not None else ""
+                print(f'{name:<11} {heuristic_type:<10} d{depth}  move {result["move"]}  {result["nodes"]:>8} nodes'
+                      f'  {result["nps"]:>9.0f} n/s  {result["time"]:7.3f} s {peak}')
+
+    report = {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "results": results,
+    }
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+
+    if save_baseline:
+        baseline = {"results": [{field: result[field] for field in BASELINE_FIELDS} for result in results]}
+        with open(baseline_path, "w") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"Baseline saved to {baseline_path}")
+        return 0
+    try:
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        print(f"No baseline at {baseline_path}; run with --save-baseline to create one.", file=sys.stderr)
+        return 2
+
+    problems = compare_to_baseline(results, baseline, threshold)
+    for problem in problems:
+        print(f"REGRESSION {problem}")
+    if not problems:
+        print(f"No regressions beyond {threshold:.0%} against {baseline_path}")
+    return 1 if problems else 0
+
+def bench_stats(depth, heuristics):
+    from minimaxAI import iterative_deepening
+    from search_stats import SearchStats
+
+    for name, moves in SEARCH_CORPUS.items():
+        board, piece = board_from_moves(moves)
+        for heuristic_type in heuristics:
+            stats = SearchStats()
+            iterative_deepening(board, piece, depth, heuristic_type=heuristic_type, stats=stats)
+            report = stats.report()
+            calls = report["eval_calls"].get(heuristic_type, 0)
+            eval_time = report["eval_time"].get(heuristic_type, 0.0)
+            per_call = eval_time / calls * 1e6 if calls else 0.0
+            print(f'{name:<11} {heuristic_type:<10} {report["nodes"]:>8} nodes  EBF {report["effective_branching_factor"]:5.2f}'
+                  f'  cutoffs {report["cutoffs"]:>6} ({report["first_child_cutoff_rate"]:.0%} first child)'
+                  f'  evals {calls:>7} ({per_call:6.1f} us each)')
+            print(f'{"":<11} nodes by ply {report["nodes_by_ply"]}')
+            print(f'{"":<11} cutoffs by child {report["cutoffs_by_index"]}')
+
+def bench_render(frames):
+    import os
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pygame
+    import main as game
+
+    screen = pygame.display.set_mode((800, 600))
+    boards = random_positions(frames, seed=2)
+
+    def reload_draw(board):
+        # what draw_board did before the render cache: decode, scale and punch
+        # every hole on each call
+        board_x = (800 - game.WIDTH) // 2
+        board_y = (600 - game.HEIGHT) // 2
+        image = pygame.image.load("board_image.jpg").convert()
+        image = pygame.transform.scale(image, (game.WIDTH, game.HEIGHT - game.CELL_SIZE + 20))
+        screen.blit(image, (board_x, board_y))
+        for c in range(game.COLS):
+            for r in range(game.ROWS):
+                pygame.draw.circle(screen, game.BLACK, (board_x + c*game.CELL_SIZE + game.CELL_SIZE/2, board_y + r*game.CELL_SIZE + 20 + game.CELL_SIZE/2), game.RADIUS)
+        for c in range(game.COLS):
+            for r in range(game.ROWS):
+                if board[r][c] != 0:
+                    game.draw_piece(screen, r, c, board[r][c])
+        pygame.display.update()
+
+    def cell_draw(board):
+        game.draw_cell(screen, board, 0, 3)
+
+    game.draw_board(screen, boards[0])  # build the cached frame outside the timing
+    for name, draw in (("reload", reload_draw), ("cached", lambda board: game.draw_board(screen, board)), ("cell", cell_draw)):
+        start = time.perf_counter()
+        for board in boards:
+            draw(board)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<8} {elapsed / frames * 1000:8.3f} ms/frame")
+    pygame.quit()
+
+def bench_startup():
+    import os
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    start = time.perf_counter()
+    import pygame
+    import assets
+    import main as game
+    imported = time.perf_counter()
+
+    screen = pygame.display.set_mode((800, 600))
+    preload = assets.preload_sounds(game.SOUNDS)
+    buttons = [game.Button("Start", 300, 200, 200, 60, game.WOOD_BROWN, game.GRAY, game.WHITE)]
+    game.draw_main_menu(screen, buttons, assets.image("final_back.jpeg", (800, 600)))
+    menu = time.perf_counter()
+    preload.join()
+    print(f"import main      {(imported - start) * 1000:8.1f} ms")
+    print(f"first menu frame {(menu - imported) * 1000:8.1f} ms  (sounds still loading in the background)")
+    print(f"sounds ready     {(time.perf_counter() - imported) * 1000:8.1f} ms")
+
+    # a mode switch after the first: every asset should come from the cache
+    switch = time.perf_counter()
+    assets.image("final_back.jpeg", (800, 600))
+    game.draw_board(screen, game.create_board())
+    print(f"mode switch      {(time.perf_counter() - switch) * 1000:8.1f} ms")
+    print()
+    for name, seconds in assets.load_report():
+        print(f"{name:<40} {seconds * 1000:8.1f} ms")
+    pygame.quit()
+
+def main():
+    parser = argparse.ArgumentParser(description="Connect Four engine benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+    wincheck = sub.add_parser("wincheck", help="winning_move on list boards vs bitboards")
+    wincheck.add_argument("--positions", type=int, default=1000)
+    wincheck.add_argument("--repeat", type=int, default=20)
+    wincheck.add_argument("--rows", type=int, default=6)
+    wincheck.add_argument("--cols", type=int, default=7)
+    wincheck.add_argument("--connect", type=int, default=4)
+    evaluators = sub.add_parser("evaluators", help="time and peak allocation per call of each evaluator and the win check")
+    evaluators.add_argument("--positions", type=int, default=1000)
+    evaluators.add_argument("--repeat", type=int, default=5)
+    evaluators.add_argument("--rows", type=int, default=6)
+    evaluators.add_argument("--cols", type=int, default=7)
+    evaluators.add_argument("--connect", type=int, default=4)
+    batch = sub.add_parser("batch", help="scalar evaluators vs the NumPy batch evaluators")
+    batch.add_argument("--positions", type=int, default=5000)
+    parallel = sub.add_parser("parallel", help="sequential minimax vs root-split parallel search")
+    parallel.add_argument("--depth", type=int, default=6)
+    parallel.add_argument("--workers", type=int, default=None)
+    parallel.add_argument("--positions", type=int, default=5)
+    ordering = sub.add_parser("ordering", help="nodes searched per move ordering strategy")
+    ordering.add_argument("--depths", default="6,8")
+    ordering.add_argument("--positions", type=int, default=3)
+    ordering.add_argument("--heuristic", default="original")
+    pvs = sub.add_parser("pvs", help="nodes searched by alpha-beta vs PVS vs PVS with aspiration windows")
+    pvs.add_argument("--depths", default="6,8")
+    pvs.add_argument("--positions", type=int, default=10)
+    pvs.add_argument("--heuristics", default=",".join(HEURISTICS))
+    evalcache = sub.add_parser("evalcache", help="self-play with and without an evaluation cache kept across moves")
+    evalcache.add_argument("--depth", type=int, default=6)
+    evalcache.add_argument("--plies", type=int, default=20)
+    evalcache.add_argument("--heuristics", default=",".join(HEURISTICS))
+    evalcache.add_argument("--size-mb", type=float, default=16)
+    stats = sub.add_parser("stats", help="node counts, branching factor and cutoffs per corpus position")
+    stats.add_argument("--depth", type=int, default=6)
+    stats.add_argument("--heuristics", default=",".join(HEURISTICS))
+    render = sub.add_parser("render", help="board frame time: image reload vs cached frame vs single cell")
+    render.add_argument("--frames", type=int, default=300)
+    sub.add_parser("startup", help="time to first menu frame and per-asset load times")
+    search = sub.add_parser("search", help="search the fixed corpus and compare against a baseline")
+    search.add_argument("--depths", default="2,4,6")
+    search.add_argument("--heuristics", default=",".join(HEURISTICS))
+    search.add_argument("--output", default="bench_results.json")
+    search.add_argument("--baseline", default="bench_baseline.json")
+    search.add_argument("--save-baseline", action="store_true")
+    search.add_argument("--threshold", type=float, default=0.25, help="allowed relative slowdown, e.g. 0.25 = 25%%")
+    search.add_argument("--no-memory", action="store_true", help="skip the traced run for peak memory")
+    args = parser.parse_args()
+
+    if args.command == "wincheck":
+        bench_wincheck(args.positions, args.repeat, args.rows, args.cols, args.connect)
+    elif args.command == "evaluators":
+        bench_evaluators(args.positions, args.repeat, args.rows, args.cols, args.connect)
+    elif args.command == "batch":
+        bench_batch(args.positions)
+    elif args.command == "parallel":
+        bench_parallel(args.depth, args.workers, args.positions)
+    elif args.command == "ordering":
+        bench_ordering([int(d) for d in args.depths.split(",")], args.positions, args.heuristic)
+    elif args.command == "pvs":
+        bench_pvs([int(d) for d in args.depths.split(",")], args.positions, args.heuristics.split(","))
+    elif args.command == "evalcache":
+        bench_evalcache(args.depth, args.plies, args.heuristics.split(","), args.size_mb)
+    elif args.command == "stats":
+        bench_stats(args.depth, args.heuristics.split(","))
+    elif args.command == "render":
+        bench_render(args.frames)
+    elif args.command == "startup":
+        bench_startup()
+    elif args.command == "search":
+        sys.exit(bench_search([int(d) for d in args.depths.split(",")], args.heuristics.split(","), args.output,
+                              args.baseline, args.save_baseline, args.threshold, not args.no_memory))
+
+if __name__ == "__main__":
+    main()
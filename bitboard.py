@@ -0,0 +1,171 @@
+class BoardRow:
+    def __init__(self, board, row):
+        self.board = board
+        self.row = row
+
+    def __len__(self):
+        return self.board.cols
+
+    def __getitem__(self, col):
+        if col < 0:
+            col += self.board.cols
+        if not 0 <= col < self.board.cols:
+            raise IndexError("board column out of range")
+        return self.board.get(self.row, col)
+
+    def __setitem__(self, col, piece):
+        if col < 0:
+            col += self.board.cols
+        self.board.set(self.row, col, piece)
+
+    def __iter__(self):
+        for col in range(self.board.cols):
+            yield self.board.get(self.row, col)
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+# Cell (row, col) lives at bit col * (rows + 1) + row of its owner's mask. The
+# spare bit on top of every column stays empty so shifted lines never wrap
+# into the next column. board[r][c] reads and writes like the nested lists
+# from board.create_board, so existing code can run on a Board unchanged.
+class Board:
+    def __init__(self, rows=6, cols=7):
+        self.rows = rows
+        self.cols = cols
+        self.stride = rows + 1
+        self.masks = [0, 0]
+        self.heights = [0] * cols
+        self.moves = 0
+        self._rows = [BoardRow(self, r) for r in range(rows)]
+
+    @classmethod
+    def from_list(cls, grid):
+        board = cls(len(grid), len(grid[0]))
+        for c in range(board.cols):
+            for r in range(board.rows):
+                if grid[r][c] == 0:
+                    break
+                board.drop_piece(r, c, grid[r][c])
+        return board
+
+    def to_list(self):
+        return [list(row) for row in self._rows]
+
+    def copy(self):
+        board = Board(self.rows, self.cols)
+        board.masks = self.masks[:]
+        board.heights = self.heights[:]
+        board.moves = self.moves
+        return board
+
+    def __copy__(self):
+        return self.copy()
+
+    def __deepcopy__(self, memo):
+        return self.copy()
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, row):
+        return self._rows[row]
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def __eq__(self, other):
+        if isinstance(other, Board):
+            return self.masks == other.masks and self.rows == other.rows and self.cols == other.cols
+        return self.to_list() == [list(row) for row in other]
+
+    def __repr__(self):
+        return f"Board({self.to_list()!r})"
+
+    def get(self, row, col):
+        bit = 1 << (col * self.stride + row)
+        if self.masks[0] & bit:
+            return 1
+        if self.masks[1] & bit:
+            return 2
+        return 0
+
+    def set(self, row, col, piece):
+        if piece == 0:
+            if row != self.heights[col] - 1:
+                raise ValueError(f"can only clear the top piece of column {col}")
+            self.remove_piece(row, col)
+        else:
+            if row != self.heights[col]:
+                raise ValueError(f"cell ({row}, {col}) is not the next open cell")
+            self.drop_piece(row, col, piece)
+
+    def drop_piece(self, row, col, piece):
+        self.masks[piece - 1] |= 1 << (col * self.stride + row)
+        self.heights[col] = row + 1
+        self.moves += 1
+
+    def remove_piece(self, row, col):
+        bit = ~(1 << (col * self.stride + row))
+        self.masks[0] &= bit
+        self.masks[1] &= bit
+        self.heights[col] = row
+        self.moves -= 1
+
+    def is_valid_location(self, col):
+        return self.heights[col] < self.rows
+
+    def get_next_open_row(self, col):
+        height = self.heights[col]
+        return height if height < self.rows else -1
+
+    def winning_move(self, piece, k=4):
+        if k == 4:
+            return has_four(self.masks[piece - 1], self.stride)
+        return has_run(self.masks[piece - 1], self.stride, k)
+
+    def winning_move_at(self, row, col, piece, k=4):
+        # walk the four lines through the cell; the empty padding bit above
+        # each column stops a line from wrapping into the next one
+        mask = self.masks[piece - 1]
+        pos = col * self.stride + row
+        if not mask >> pos & 1:
+            return False
+        for shift in (1, self.stride, self.stride + 1, self.stride - 1):
+            count = 1
+            p = pos - shift
+            while count < k and p >= 0 and mask >> p & 1:
+                count += 1
+                p -= shift
+            p = pos + shift
+            while count < k and mask >> p & 1:
+                count += 1
+                p += shift
+            if count >= k:
+                return True
+        return False
+
+
+def has_four(mask, stride=7):
+    # vertical, horizontal, "/" diagonal, "\" diagonal
+    for shift in (1, stride, stride + 1, stride - 1):
+        pairs = mask & (mask >> shift)
+        if pairs & (pairs >> (2 * shift)):
+            return True
+    return False
+
+def has_run(mask, stride, k):
+    # k in a row along any direction, for connect lengths other than four
+    for shift in (1, stride, stride + 1, stride - 1):
+        run = mask
+        for i in range(1, k):
+            run &= mask >> (i * shift)
+            if not run:
+                break
+        if run:
+            return True
+    return False
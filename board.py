@@ -1,40 +1,73 @@
+from bitboard import Board
+from windows import flat_board, window_table
+
 def create_board(rows=6, cols=7):
     return [[0 for _ in range(cols)] for _ in range(rows)]
 
 def drop_piece(board, row, col, piece):
+    if isinstance(board, Board):
+        board.drop_piece(row, col, piece)
+        return
     board[row][col] = piece
 
+def remove_piece(board, row, col):
+    if isinstance(board, Board):
+        board.remove_piece(row, col)
+        return
+    board[row][col] = 0
+
 def is_valid_location(board, col):
+    if isinstance(board, Board):
+        return board.is_valid_location(col)
     return board[len(board)-1][col] == 0
 
 def get_next_open_row(board, col):
+    if isinstance(board, Board):
+        return board.get_next_open_row(col)
     for r in range(len(board)):
         if board[r][col] == 0:
             return r
     return -1
 
-def winning_move(board, piece):
+def winning_move(board, piece, k=4):
+    if isinstance(board, Board):
+        return board.winning_move(piece, k)
+    flat = flat_board(board)
+    windows = window_table(len(board), len(board[0]), k).flat_windows
+    if k == 4:
+        for a, b, c, d in windows:
+            if flat[a] == flat[b] == flat[c] == flat[d] == piece:
+                return True
+        return False
+    return any(all(flat[i] == piece for i in window) for window in windows)
+
+# vertical, horizontal, "/" diagonal, "\" diagonal as (row, col) steps
+LINE_DIRECTIONS = ((1, 0), (0, 1), (1, 1), (1, -1))
+
+def winning_move_at(board, row, col, piece, k=4):
+    # only the lines through (row, col) can have been completed by a piece
+    # dropped there, so this is O(k) instead of a scan of the whole board
+    if isinstance(board, Board):
+        return board.winning_move_at(row, col, piece, k)
+    if board[row][col] != piece:
+        return False
     rows = len(board)
     cols = len(board[0])
-    
-    for r in range(rows):
-        for c in range(cols-3):
-            if all(board[r][c+i] == piece for i in range(4)):
-                return True
-    
-    for c in range(cols):
-        for r in range(rows-3):
-            if all(board[r+i][c] == piece for i in range(4)):
-                return True
-    
-    for r in range(rows-3):
-        for c in range(cols-3):
-            if all(board[r+i][c+i] == piece for i in range(4)):
-                return True
-    
-    for r in range(3, rows):
-        for c in range(cols-3):
-            if all(board[r-i][c+i] == piece for i in range(4)):
-                return True
-    
-    return False
\ No newline at end of file
+    for dr, dc in LINE_DIRECTIONS:
+        count = 1
+        r, c = row - dr, col - dc
+        while count < k and 0 <= r < rows and 0 <= c < cols and board[r][c] == piece:
+            count += 1
+            r, c = r - dr, c - dc
+        r, c = row + dr, col + dc
+        while count < k and 0 <= r < rows and 0 <= c < cols and board[r][c] == piece:
+            count += 1
+            r, c = r + dr, c + dc
+        if count >= k:
+            return True
+    return False
+
+def is_mirror_symmetric(board):
+    # True when the position reads the same with the columns reversed
+    cols = len(board[0])
+    return all(board[r][c] == board[r][cols-1-c] for r in range(len(board)) for c in range(cols // 2))
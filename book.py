@@ -0,0 +1,215 @@
+import argparse
+import mmap
+import os
+import struct
+import time
+from array import array
+from bisect import bisect_left
+
+from solver import (CELLS, COLUMN_MASKS, COLUMN_ORDER, TOP_MASKS, BOTTOM_MASKS, WIDTH, Solver,
+                    canonical_key, is_symmetric, mirror, position_from_moves, position_key, winning_positions)
+
+# Book file layout: a 16 byte header (magic, plies, entry count) followed by
+# the sorted position keys as uint64, then one int8 score and one int8 best
+# move per key. Keys and scores follow solver.position_key and Solver.solve.
+# Only one of each mirror-image pair is stored, under the smaller key; the
+# move is for that orientation and lookups flip it back.
+MAGIC = b"C4BOOK02"
+HEADER = struct.Struct("<8sII")
+
+# The generator appends one record per solved position to a journal, so an
+# interrupted run picks up where it stopped.
+JOURNAL_RECORD = struct.Struct("<Qbb")
+
+DEFAULT_BOOK = "opening_book.bin"
+DEFAULT_JOURNAL = "opening_book.journal"
+
+class OpeningBook:
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.plies, self.count = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not an opening book")
+        view = memoryview(self.data)
+        keys_end = HEADER.size + 8 * self.count
+        self.keys = view[HEADER.size:keys_end].cast("Q")
+        self.scores = view[keys_end:keys_end + self.count].cast("b")
+        self.moves = view[keys_end + self.count:keys_end + 2 * self.count].cast("b")
+
+    def __len__(self):
+        return self.count
+
+    def find(self, key):
+        index = bisect_left(self.keys, key)
+        if index < self.count and self.keys[index] == key:
+            return index
+        return -1
+
+    def score(self, key):
+        index = self.find(canonical_key(key))
+        return None if index < 0 else self.scores[index]
+
+    def lookup(self, key):
+        mirrored = mirror(key)
+        index = self.find(min(key, mirrored))
+        if index < 0:
+            return None
+        move = self.moves[index]
+        return (WIDTH - 1 - move if mirrored < key else move), self.scores[index]
+
+    def close(self):
+        for view in ("keys", "scores", "moves"):
+            if hasattr(self, view):
+                getattr(self, view).release()
+        self.data.close()
+        self.file.close()
+
+def load_book(path=DEFAULT_BOOK):
+    if not os.path.exists(path):
+        return None
+    try:
+        return OpeningBook(path)
+    except (OSError, ValueError) as e:
+        print(f"Error loading opening book: {e}. Opening book disabled.")
+        return None
+
+def write_book(path, entries, plies):
+    keys = sorted(entries)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, plies, len(keys)))
+        array("Q", keys).tofile(f)
+        array("b", [entries[key][0] for key in keys]).tofile(f)
+        array("b", [entries[key][1] for key in keys]).tofile(f)
+    os.replace(tmp_path, path)
+
+def read_journal(path):
+    entries = {}
+    if not os.path.exists(path):
+        return entries
+    with open(path, "rb") as f:
+        data = f.read()
+    # a run killed mid-write can leave a partial record at the end
+    usable = len(data) - len(data) % JOURNAL_RECORD.size
+    for key, score, move in JOURNAL_RECORD.iter_unpack(data[:usable]):
+        # journals from before mirrored positions were merged can hold
+        # either orientation
+        mirrored = mirror(key)
+        if mirrored < key:
+            key, move = mirrored, WIDTH - 1 - move
+        entries[key] = (score, move)
+    return entries
+
+def canonical_position(current, mask):
+    # the orientation whose key is the smaller of the mirror pair
+    key = position_key(current, mask)
+    mirrored = mirror(key)
+    if mirrored < key:
+        return mirrored, (mirror(current), mirror(mask))
+    return key, (current, mask)
+
+def enumerate_positions(plies):
+    # levels[n] maps key -> (current, mask) for every live position after n
+    # moves, one per mirror-image pair
+    levels = [{position_key(0, 0): (0, 0)}]
+    for _ in range(plies - 1):
+        level = {}
+        for current, mask in levels[-1].values():
+            wins = winning_positions(current, mask)
+            for col in range(WIDTH):
+                if mask & TOP_MASKS[col]:
+                    continue
+                move = (mask + BOTTOM_MASKS[col]) & COLUMN_MASKS[col]
+                if wins & move:
+                    continue
+                key, child = canonical_position(current ^ mask, mask | move)
+                level[key] = child
+        levels.append(level)
+    return levels
+
+def generate(plies, journal_path, book_path, tt_size_mb):
+    entries = read_journal(journal_path)
+    levels = enumerate_positions(plies)
+    total = sum(len(level) for level in levels)
+    print(f"{total} positions over {plies} plies, {len(entries)} already solved")
+
+    solver = Solver(tt_size_mb)
+    start = time.time()
+    done = len(entries)
+    with open(journal_path, "ab") as journal:
+        # deepest level first, so shallower positions read their children
+        # from the journal instead of searching
+        for moves in range(plies - 1, -1, -1):
+            for key, (current, mask) in levels[moves].items():
+                if key in entries:
+                    continue
+                wins = winning_positions(current, mask)
+                symmetric = is_symmetric(current, mask)
+                best_col, best_score = None, None
+                for col in COLUMN_ORDER:
+                    if mask & TOP_MASKS[col]:
+                        continue
+                    if symmetric and col > WIDTH - 1 - col:
+                        # same score as its mirror, which COLUMN_ORDER has already tried
+                        continue
+                    move = (mask + BOTTOM_MASKS[col]) & COLUMN_MASKS[col]
+                    if wins & move:
+                        score = (CELLS + 1 - moves) // 2
+                    else:
+                        child = (current ^ mask, mask | move)
+                        known = entries.get(canonical_key(position_key(*child)))
+                        if known is not None:
+                            score = -known[0]
+                        else:
+                            score = -solver.solve(child[0], child[1], moves + 1)
+                    if best_score is None or score > best_score:
+                        best_col, best_score = col, score
+                entries[key] = (best_score, best_col)
+                journal.write(JOURNAL_RECORD.pack(key, best_score, best_col))
+                journal.flush()
+                done += 1
+                if done % 100 == 0:
+                    print(f"{done}/{total} solved, ply {moves}, {time.time() - start:.0f}s, {solver.nodes} nodes")
+
+    write_book(book_path, entries, plies)
+    print(f"Wrote {len(entries)} positions to {book_path}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Connect Four opening book")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    gen = sub.add_parser("generate", help="solve every position of the first N plies (resumable)")
+    gen.add_argument("--plies", type=int, default=8)
+    gen.add_argument("--journal", default=DEFAULT_JOURNAL)
+    gen.add_argument("--out", default=DEFAULT_BOOK)
+    gen.add_argument("--tt-mb", type=int, default=256)
+
+    build = sub.add_parser("build", help="write a book from an existing journal")
+    build.add_argument("--plies", type=int, default=8)
+    build.add_argument("--journal", default=DEFAULT_JOURNAL)
+    build.add_argument("--out", default=DEFAULT_BOOK)
+
+    lookup = sub.add_parser("lookup", help="look up a position given as 0-based column digits")
+    lookup.add_argument("moves", nargs="?", default="")
+    lookup.add_argument("--book", default=DEFAULT_BOOK)
+
+    args = parser.parse_args()
+    if args.command == "generate":
+        generate(args.plies, args.journal, args.out, args.tt_mb)
+    elif args.command == "build":
+        entries = read_journal(args.journal)
+        write_book(args.out, entries, args.plies)
+        print(f"Wrote {len(entries)} positions to {args.out}")
+    elif args.command == "lookup":
+        book = load_book(args.book)
+        if book is None:
+            print(f"No opening book at {args.book}")
+            return
+        current, mask, _ = position_from_moves([int(c) for c in args.moves])
+        print(book.lookup(position_key(current, mask)))
+        book.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+from collections import OrderedDict
+
+# Rough cost of one entry: the OrderedDict slot and link plus a 64-bit int
+# key and an int value, measured with tracemalloc.
+ENTRY_BYTES = 176
+DEFAULT_SIZE_MB = 16
+
+class EvalCache:
+    # Leaf evaluations by position, least recently used evicted first.
+    # Keys are search keys with the side-to-move salt removed, so they
+    # already separate heuristics and the side the score is for; mirror
+    # images share a key for the symmetric heuristics. Keep one cache for a
+    # whole game (or a worker's games) so leaves reached again on later
+    # moves are not evaluated twice.
+    def __init__(self, entries=None, size_mb=None):
+        if entries is None:
+            entries = int((DEFAULT_SIZE_MB if size_mb is None else size_mb) * 1024 * 1024 // ENTRY_BYTES)
+        self.capacity = max(1, entries)
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,127 @@
+from windows import VERTICAL, window_table
+
+def window_score(own, opp, empty, k=4):
+    # the same rules as score_window in evaluate_position, on counts
+    score = 0
+    if own == k:
+        score += 100000
+    elif own == k - 1 and empty == 1:
+        score += 100
+    elif own == k - 2 and empty == 2:
+        score += 10
+    elif k > 3 and own == k - 3 and empty == 3:
+        score += 1
+
+    if opp == k - 1 and empty == 1:
+        score -= 200
+    elif opp == k - 2 and empty == 2:
+        score -= 15
+    return score
+
+_window_scores = {}
+
+def window_scores(k=4):
+    # window_score for every (own, opp) split of a k-cell window
+    table = _window_scores.get(k)
+    if table is None:
+        table = [[window_score(own, opp, k - own - opp, k) if own + opp <= k else 0 for opp in range(k + 1)] for own in range(k + 1)]
+        _window_scores[k] = table
+    return table
+
+_code_scores = {}
+
+def code_scores(k=4):
+    # window_score indexed by the window sums of windows.window_codes
+    table = _code_scores.get(k)
+    if table is None:
+        scores = window_scores(k)
+        table = [0] * (k * (k + 1) + 1)
+        for own in range(k + 1):
+            for opp in range(k + 1 - own):
+                table[own + (k + 1) * opp] = scores[own][opp]
+        table = tuple(table)
+        _code_scores[k] = table
+    return table
+
+class IncrementalEvaluator:
+    # Keeps evaluate_position(board, piece) up to date as pieces are added
+    # and removed, touching only the windows through the changed cell.
+    def __init__(self, board, piece, k=4):
+        self.piece = piece
+        self.rows = len(board)
+        self.cols = len(board[0])
+        self.k = k
+        self.window_scores = window_scores(k)
+        table = window_table(self.rows, self.cols, k)
+        self.cell_windows = table.cell_windows
+        self.own = [0] * len(table.windows)
+        self.opp = [0] * len(table.windows)
+        # empty windows already score for k = 2 (own == k - 2, two empty)
+        self.window_total = len(table.windows) * self.window_scores[0][0]
+        self.position_total = 0
+
+        # vertical windows in the edge columns feed the -150 threat penalty
+        self.threat_column = [-1] * len(table.windows)
+        for index, window in enumerate(table.windows):
+            col = window[0][1]
+            if table.directions[index] == VERTICAL and col in (0, self.cols - 1):
+                self.threat_column[index] = col
+        self.threats = {0: 0, self.cols - 1: 0}
+
+        for r in range(self.rows):
+            for c in range(self.cols):
+                if board[r][c] != 0:
+                    self.add(r, c, board[r][c])
+
+    def add(self, row, col, piece):
+        own = self.own
+        opp = self.opp
+        scores = self.window_scores
+        threat = self.k - 1
+        for index in self.cell_windows[row][col]:
+            before = scores[own[index]][opp[index]]
+            was_threat = opp[index] == threat and own[index] == 0
+            if piece == self.piece:
+                own[index] += 1
+            else:
+                opp[index] += 1
+            self.window_total += scores[own[index]][opp[index]] - before
+            if self.threat_column[index] >= 0:
+                self.threats[self.threat_column[index]] += (opp[index] == threat and own[index] == 0) - was_threat
+        if piece == self.piece:
+            self.position_total += self.cell_value(col)
+
+    def remove(self, row, col, piece):
+        own = self.own
+        opp = self.opp
+        scores = self.window_scores
+        threat = self.k - 1
+        for index in self.cell_windows[row][col]:
+            before = scores[own[index]][opp[index]]
+            was_threat = opp[index] == threat and own[index] == 0
+            if piece == self.piece:
+                own[index] -= 1
+            else:
+                opp[index] -= 1
+            self.window_total += scores[own[index]][opp[index]] - before
+            if self.threat_column[index] >= 0:
+                self.threats[self.threat_column[index]] += (opp[index] == threat and own[index] == 0) - was_threat
+        if piece == self.piece:
+            self.position_total -= self.cell_value(col)
+
+    def cell_value(self, col):
+        value = 0
+        if col == self.cols // 2:
+            value += 6
+        if col == 0:
+            value -= 1
+        if col == self.cols - 1:
+            value -= 1
+        return value
+
+    def score(self):
+        score = self.position_total + self.window_total
+        for count in self.threats.values():
+            if count:
+                score -= 150
+        return score
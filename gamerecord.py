@@ -0,0 +1,168 @@
+import os
+
+from bitboard import Board
+from board import create_board, drop_piece, get_next_open_row
+
+# One column per character, so boards up to 36 columns wide fit.
+MOVE_CHARS = "0123456789abcdefghijklmnopqrstuvwxyz"
+MOVE_INDEX = {char: col for col, char in enumerate(MOVE_CHARS)}
+RESULTS = ("0", "1", "2", "*")  # draw, player 1, player 2, unfinished
+HEADER_PREFIX = "# c4games"
+EMPTY_GAME = "-"
+
+def encode_moves(moves):
+    return "".join(MOVE_CHARS[col] for col in moves)
+
+def decode_moves(text):
+    return [MOVE_INDEX[char] for char in text]
+
+def board_from_moves(moves, rows=6, cols=7, bitboard=False):
+    # moves is a list of columns or a move string; returns (board, piece to move)
+    if isinstance(moves, str):
+        moves = decode_moves(moves)
+    board = Board(rows, cols) if bitboard else create_board(rows, cols)
+    piece = 1
+    for col in moves:
+        drop_piece(board, get_next_open_row(board, col), col, piece)
+        piece = 3 - piece
+    return board, piece
+
+# Position keys pack a whole position into one integer, as in the solver:
+# the side to move's pieces plus the occupied cells plus one bit at the
+# bottom of every column. Each column then reads as a marker bit at its
+# height with the mover's pieces below it. A 6x7 key fits in 49 bits and
+# anything with (rows + 1) * cols <= 64 fits in a 64-bit word.
+def bottom_mask(rows, cols):
+    return sum(1 << (col * (rows + 1)) for col in range(cols))
+
+def encode_position(board, piece=None):
+    if not isinstance(board, Board):
+        board = Board.from_list(board)
+    if piece is None:
+        piece = 1 if board.moves % 2 == 0 else 2
+    occupied = board.masks[0] | board.masks[1]
+    return board.masks[piece - 1] + occupied + bottom_mask(board.rows, board.cols)
+
+def decode_position(key, rows=6, cols=7, piece=None):
+    # returns a Board and the side to move
+    stride = rows + 1
+    columns = []
+    moves = 0
+    for col in range(cols):
+        bits = key >> (col * stride) & ((1 << stride) - 1)
+        height = bits.bit_length() - 1
+        columns.append((bits, height))
+        moves += height
+    if piece is None:
+        piece = 1 if moves % 2 == 0 else 2
+    board = Board(rows, cols)
+    for col, (bits, height) in enumerate(columns):
+        for row in range(height):
+            board.drop_piece(row, col, piece if bits >> row & 1 else 3 - piece)
+    return board, piece
+
+class GameRecord:
+    def __init__(self, moves, result="*", tags=None, rows=6, cols=7, connect=4):
+        self.moves = moves
+        self.result = result
+        self.tags = tags or {}
+        self.rows = rows
+        self.cols = cols
+        self.connect = connect
+
+    def __len__(self):
+        return len(self.moves)
+
+    def position(self, ply=None):
+        # board after the first ply moves (all of them by default)
+        return board_from_moves(self.moves[:ply], self.rows, self.cols)
+
+    def to_line(self):
+        fields = [encode_moves(self.moves) or EMPTY_GAME, self.result]
+        fields += [f"{name}={value}" for name, value in self.tags.items()]
+        return " ".join(fields)
+
+# Game files are plain text: a header line naming the board, then one game
+# per line as "<moves> <result> [name=value ...]". Moves are appended as
+# they are played and the result closes the line, so a file can be tailed
+# while games are running and a crash loses at most the game in progress.
+class GameWriter:
+    def __init__(self, path, rows=6, cols=7, connect=4):
+        self.rows = rows
+        self.cols = cols
+        self.connect = connect
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        open_line = False
+        if exists:
+            header = read_header(path)
+            if header != (rows, cols, connect):
+                raise ValueError(f"{path} holds {header[0]}x{header[1]} connect {header[2]} games")
+            with open(path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                open_line = f.read(1) != b"\n"
+        self.file = open(path, "a")
+        if not exists:
+            self.file.write(f"{HEADER_PREFIX} rows={rows} cols={cols} connect={connect}\n")
+        elif open_line:
+            # the previous writer stopped mid-game; that game reads back as unfinished
+            self.file.write("\n")
+        self.file.flush()
+        self.in_game = False
+
+    def move(self, col):
+        self.file.write(MOVE_CHARS[col])
+        self.file.flush()
+        self.in_game = True
+
+    def finish(self, result, tags=None):
+        record = GameRecord([], check_result(result), tags)
+        line = record.to_line()
+        if self.in_game:
+            line = line[len(EMPTY_GAME):]
+        self.file.write(line + "\n")
+        self.file.flush()
+        self.in_game = False
+
+    def write_game(self, moves, result, tags=None):
+        self.file.write(GameRecord(moves, check_result(result), tags).to_line() + "\n")
+        self.file.flush()
+
+    def close(self):
+        if self.in_game:
+            self.finish("*")
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def check_result(result):
+    result = str(result)
+    if result not in RESULTS:
+        raise ValueError(f"game result must be one of {RESULTS}, not {result!r}")
+    return result
+
+def read_header(path):
+    with open(path) as f:
+        line = f.readline()
+    if not line.startswith(HEADER_PREFIX):
+        raise ValueError(f"{path} is not a game record file")
+    fields = dict(field.split("=") for field in line.split()[2:])
+    return int(fields["rows"]), int(fields["cols"]), int(fields["connect"])
+
+def read_games(path):
+    # lazily yields GameRecords; a trailing game without a result is
+    # reported as unfinished
+    rows, cols, connect = read_header(path)
+    with open(path) as f:
+        f.readline()
+        for line in f:
+            fields = line.split()
+            if not fields or fields[0].startswith("#"):
+                continue
+            moves = [] if fields[0] == EMPTY_GAME else decode_moves(fields[0])
+            result = fields[1] if len(fields) > 1 else "*"
+            tags = dict(field.split("=", 1) for field in fields[2:])
+            yield GameRecord(moves, result, tags, rows, cols, connect)
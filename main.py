@@ -1,6 +1,11 @@
 import pygame
-from board import create_board, drop_piece, is_valid_location, get_next_open_row, winning_move
-from minimaxAI import minimax
+import assets
+from board import create_board, drop_piece, is_valid_location, get_next_open_row, winning_move_at
+from ai_player import BackgroundMove, Ponder, ReadyMove
+from evalcache import EvalCache
+from book import load_book
+from gamerecord import GameWriter
+from transposition import TranspositionTable
 
 pygame.init()
 
@@ -10,6 +15,9 @@ CELL_SIZE = 70
 WIDTH = COLS * CELL_SIZE
 HEIGHT = (ROWS + 1) * CELL_SIZE
 RADIUS = int(CELL_SIZE / 2 - 5)
+PERFECT_PLAY_DEPTH = 6
+# every game played in the window is appended here
+GAME_RECORD = "games.c4"
 
 WOOD_BROWN = (139, 69, 19)
 BLACK = (0, 0, 0)
@@ -22,14 +30,9 @@ DARK_GRAY = (50, 50, 50)
 GRADIENT_TOP = (75, 0, 130)
 GRADIENT_BOTTOM = (255, 105, 180)
 
-drop_sound = win_sound = draw_sound = None
-try:
-    drop_sound = pygame.mixer.Sound("drop.wav")
-    win_sound = pygame.mixer.Sound("win.wav")
-    draw_sound = pygame.mixer.Sound("draw.wav")
-    print("Sound files loaded successfully.")
-except pygame.error as e:
-    print(f"Error loading sound files: {e}. Sound effects disabled.")
+SOUNDS = ("drop.wav", "win.wav", "draw.wav")
+
+opening_book = load_book()
 
 class Button:
     def __init__(self, text, x, y, width, height, color, hover_color, text_color):
@@ -38,11 +41,7 @@ class Button:
         self.color = color
         self.hover_color = hover_color
         self.text_color = text_color
-        try:
-            self.font = pygame.font.Font("Game Paused DEMO.otf", 40)
-        except pygame.error:
-            self.font = pygame.font.SysFont("sans", 40)
-            print("Custom font not found, using 'sans' fallback.")
+        self.font = assets.font("Game Paused DEMO.otf", 40)
 
     def draw(self, screen):
         mouse_pos = pygame.mouse.get_pos()
@@ -68,7 +67,7 @@ class TextInput:
         self.max_length = max_length
         self.active = False
         self.submitted = False
-        self.font = pygame.font.SysFont("georgia", 26)
+        self.font = assets.sys_font("georgia", 26)
         self.color = (139, 69, 19)  
         self.active_color = (169, 99, 49)  
         self.submitted_color = (109, 39, 0)  
@@ -142,10 +141,7 @@ def get_player_names(screen, game_mode, background_image):
                 b = GRADIENT_TOP[2] + (GRADIENT_BOTTOM[2] - GRADIENT_TOP[2]) * y / 600
                 pygame.draw.line(screen, (int(r), int(g), int(b)), (0, y), (800, y))
         
-        try:
-            title_font = pygame.font.Font("Game Paused DEMO.otf", 60)
-        except pygame.error:
-            title_font = pygame.font.SysFont("sans", 60)
+        title_font = assets.font("Game Paused DEMO.otf", 60)
         title = title_font.render("Enter Player Names", True, WHITE)
         title_rect = title.get_rect(center=(800 // 2, 100))
         screen.blit(title, title_rect)
@@ -159,33 +155,72 @@ def get_player_names(screen, game_mode, background_image):
 
     return names
 
-def draw_board(screen, board):
+_board_frame = None
+
+def board_frame():
+    # board image with the empty holes already punched, built once
+    global _board_frame
+    if _board_frame is None:
+        board_image = assets.image("board_image.jpg", (WIDTH, HEIGHT-CELL_SIZE+20))
+        if board_image is not None:
+            frame = board_image.copy()
+            for c in range(COLS):
+                for r in range(ROWS):
+                    pygame.draw.circle(frame, BLACK, (c*CELL_SIZE+CELL_SIZE/2, r*CELL_SIZE+20+CELL_SIZE/2), RADIUS)
+        else:
+            print("Falling back to wood brown background.")
+            frame = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+            for c in range(COLS):
+                for r in range(ROWS):
+                    pygame.draw.rect(frame, WOOD_BROWN, (c*CELL_SIZE, r*CELL_SIZE, CELL_SIZE, CELL_SIZE))
+                    pygame.draw.circle(frame, BLACK, (c*CELL_SIZE+CELL_SIZE/2, r*CELL_SIZE+CELL_SIZE+CELL_SIZE/2), RADIUS)
+        _board_frame = frame
+    return _board_frame
+
+def cell_rect(row, col):
+    # screen rectangle of a cell; row 0 is the bottom of the board
+    board_x = (800 - WIDTH) // 2
+    board_y = (600 - HEIGHT) // 2
+    return pygame.Rect(board_x + col*CELL_SIZE, board_y + (ROWS-row-1)*CELL_SIZE+20, CELL_SIZE, CELL_SIZE)
 
+def draw_piece(screen, row, col, piece):
+    color = ASPARAGUS if piece == 1 else PINK
+    pygame.draw.circle(screen, color, cell_rect(row, col).center, RADIUS)
+
+def draw_board(screen, board):
     board_x = (800 - WIDTH) // 2
-    board_y = (600 - HEIGHT) // 2  
-    board_image = None
-    try:
-        board_image = pygame.image.load("board_image.jpg").convert()
-        board_image = pygame.transform.scale(board_image, (WIDTH, HEIGHT-CELL_SIZE+20))
-        screen.blit(board_image, (board_x, board_y))
-        for c in range(COLS):
-            for r in range(ROWS):
-                pygame.draw.circle(screen, BLACK, (board_x + c*CELL_SIZE+CELL_SIZE/2, board_y + r*CELL_SIZE+20+CELL_SIZE/2), RADIUS)
-    except pygame.error as e:
-        print(f"Error loading board image: {e}. Falling back to wood brown background.")
-        for c in range(COLS):
-            for r in range(ROWS):
-                pygame.draw.rect(screen, WOOD_BROWN, (board_x + c*CELL_SIZE, board_y + r*CELL_SIZE, CELL_SIZE, CELL_SIZE))
-                pygame.draw.circle(screen, BLACK, (board_x + c*CELL_SIZE+CELL_SIZE/2, board_y + r*CELL_SIZE+CELL_SIZE+CELL_SIZE/2), RADIUS)
-    
+    board_y = (600 - HEIGHT) // 2
+    screen.blit(board_frame(), (board_x, board_y))
     for c in range(COLS):
         for r in range(ROWS):
-            if board[r][c] == 1:
-                pygame.draw.circle(screen, ASPARAGUS, (board_x + c*CELL_SIZE+CELL_SIZE/2, board_y + (ROWS-r-1)*CELL_SIZE+20+CELL_SIZE/2), RADIUS)
-            elif board[r][c] == 2:
-                pygame.draw.circle(screen, PINK, (board_x + c*CELL_SIZE+CELL_SIZE/2, board_y + (ROWS-r-1)*CELL_SIZE+20+CELL_SIZE/2), RADIUS)
+            if board[r][c] != 0:
+                draw_piece(screen, r, c, board[r][c])
     pygame.display.update()
 
+def draw_cell(screen, board, row, col):
+    # redraw and push a single cell after a move instead of the whole board
+    board_x = (800 - WIDTH) // 2
+    board_y = (600 - HEIGHT) // 2
+    rect = cell_rect(row, col)
+    screen.blit(board_frame(), rect, rect.move(-board_x, -board_y))
+    if board[row][col] != 0:
+        draw_piece(screen, row, col, board[row][col])
+    pygame.display.update(rect)
+
+def draw_thinking(screen, color):
+    board_x = (800 - WIDTH) // 2
+    pygame.draw.rect(screen, BLACK, (board_x, 0, WIDTH, CELL_SIZE))
+    dots = "." * (pygame.time.get_ticks() // 400 % 4)
+    font = assets.sys_font("sans", 30)
+    label = font.render(f"AI is thinking{dots}", True, color)
+    screen.blit(label, label.get_rect(midleft=(board_x + 20, CELL_SIZE // 2)))
+    pygame.display.update((board_x, 0, WIDTH, CELL_SIZE))
+
+def clear_thinking(screen):
+    board_x = (800 - WIDTH) // 2
+    pygame.draw.rect(screen, BLACK, (board_x, 0, WIDTH, CELL_SIZE))
+    pygame.display.update((board_x, 0, WIDTH, CELL_SIZE))
+
 def draw_main_menu(screen, buttons, background_image):
     if background_image is not None:
         screen.blit(background_image, (0, 0))
@@ -195,10 +230,7 @@ def draw_main_menu(screen, buttons, background_image):
             g = GRADIENT_TOP[1] + (GRADIENT_BOTTOM[1] - GRADIENT_TOP[1]) * y / 600
             b = GRADIENT_TOP[2] + (GRADIENT_BOTTOM[2] - GRADIENT_TOP[2]) * y / 600
             pygame.draw.line(screen, (int(r), int(g), int(b)), (0, y), (800, y))
-    try:
-        title_font = pygame.font.Font("Game Paused DEMO.otf", 60)
-    except pygame.error:
-        title_font = pygame.font.SysFont("sans", 60)
+    title_font = assets.font("Game Paused DEMO.otf", 60)
     title = title_font.render("Connect Four", True, WHITE)
     title_rect = title.get_rect(center=(800 // 2, 100))
     screen.blit(title, title_rect)
@@ -215,10 +247,7 @@ def draw_choose_option(screen, buttons, background_image):
             g = GRADIENT_TOP[1] + (GRADIENT_BOTTOM[1] - GRADIENT_TOP[1]) * y / 600
             b = GRADIENT_TOP[2] + (GRADIENT_BOTTOM[2] - GRADIENT_TOP[2]) * y / 600
             pygame.draw.line(screen, (int(r), int(g), int(b)), (0, y), (800, y))
-    try:
-        title_font = pygame.font.Font("Game Paused DEMO.otf", 60)
-    except pygame.error:
-        title_font = pygame.font.SysFont("sans", 60)
+    title_font = assets.font("Game Paused DEMO.otf", 60)
     title = title_font.render("Choose Game Mode", True, WHITE)
     title_rect = title.get_rect(center=(800 // 2, 100))
     screen.blit(title, title_rect)
@@ -238,10 +267,7 @@ def draw_difficulty_menu(screen, buttons, background_image):
             g = GRADIENT_TOP[1] + (GRADIENT_BOTTOM[1] - GRADIENT_TOP[1]) * y / 600
             b = GRADIENT_TOP[2] + (GRADIENT_BOTTOM[2] - GRADIENT_TOP[2]) * y / 600
             pygame.draw.line(screen, (int(r), int(g), int(b)), (0, y), (800, y))
-    try:
-        title_font = pygame.font.Font("Game Paused DEMO.otf", 60)
-    except pygame.error:
-        title_font = pygame.font.SysFont("sans", 60)
+    title_font = assets.font("Game Paused DEMO.otf", 60)
     title = title_font.render("Select Difficulty", True, WHITE)
     title_rect = title.get_rect(center=(800 // 2, 100))
     screen.blit(title, title_rect)
@@ -251,26 +277,63 @@ def draw_difficulty_menu(screen, buttons, background_image):
         button.draw(screen)
     pygame.display.update()
 
+class NoRecord:
+    # takes GameWriter's calls when the games can't be recorded
+    def move(self, col):
+        pass
+
+    def finish(self, result, tags=None):
+        pass
+
+    def close(self):
+        pass
+
+def open_game_record():
+    # a games.c4 that can't be opened, or holds another board size (say from
+    # a tournament), mustn't stop the game from starting
+    try:
+        return GameWriter(GAME_RECORD)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Not recording this game: {e}")
+        return NoRecord()
+
 def play_ai_vs_player(screen, depth, player_name):
-    background_image = pygame.image.load("final_back.jpeg").convert()
-    background_image = pygame.transform.scale(background_image, (800, 600))
-    print("Background image loaded successfully.")
+    background_image = assets.image("final_back.jpeg", (800, 600))
     if background_image is not None:
         screen.blit(background_image, (0, 0))
 
     board = create_board()
+    record = open_game_record()
+    # The AI's table is kept for the whole game, and it ponders its replies
+    # while the player thinks. No evaluation cache: the "original" heuristic
+    # is scored incrementally and never reads one.
+    ai_options = dict(heuristic_type="original", perfect_play=depth >= PERFECT_PLAY_DEPTH, book=opening_book,
+                      tt=TranspositionTable())
     game_over = False
     turn = 0
     draw_board(screen, board)
     back_button = Button("Back", 20, 20, 100, 40, WOOD_BROWN, GRAY, WHITE)
+    ai_move = None
+    ponder = Ponder(board, 2, depth, **ai_options)
+    clock = pygame.time.Clock()
 
     while not game_over:
         back_button.draw(screen)
-        pygame.display.update()
+        pygame.display.update(back_button.rect)
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
+                if ai_move:
+                    ai_move.cancel()
+                if ponder:
+                    ponder.cancel()
+                record.close()
                 return "quit"
             if back_button.is_clicked(event):
+                if ai_move:
+                    ai_move.cancel()
+                if ponder:
+                    ponder.cancel()
+                record.close()
                 return "main_menu"
             if event.type == pygame.MOUSEMOTION and turn == 0:
                 board_x = (800 - WIDTH) // 2
@@ -278,24 +341,26 @@ def play_ai_vs_player(screen, depth, player_name):
                 posx = event.pos[0]
                 if board_x <= posx < board_x + WIDTH:
                     pygame.draw.circle(screen, ASPARAGUS, (posx, CELL_SIZE/2), RADIUS)
-                pygame.display.update()
+                pygame.display.update((board_x, 0, WIDTH, CELL_SIZE))
             if event.type == pygame.MOUSEBUTTONDOWN and turn == 0:
                 board_x = (800 - WIDTH) // 2
                 pygame.draw.rect(screen, BLACK, (board_x, 0, WIDTH, CELL_SIZE))
+                pygame.display.update((board_x, 0, WIDTH, CELL_SIZE))
                 posx = event.pos[0]
                 if board_x <= posx < board_x + WIDTH:
                     col = (posx - board_x) // CELL_SIZE
                     if is_valid_location(board, col):
                         row = get_next_open_row(board, col)
                         drop_piece(board, row, col, 1)
-                        if drop_sound:
-                            drop_sound.play()
-                        if winning_move(board, 1):
+                        record.move(col)
+                        assets.play_sound("drop.wav")
+                        reply = ponder.reply(col)
+                        ponder = None
+                        if reply is not None:
+                            ai_move = ReadyMove(reply)
+                        if winning_move_at(board, row, col, 1):
                             draw_board(screen, board)
-                            try:
-                                font = pygame.font.Font("Game Paused DEMO.otf", 80)
-                            except pygame.error:
-                                font = pygame.font.SysFont("sans", 80)
+                            font = assets.font("Game Paused DEMO.otf", 80)
                             label = font.render(f"Victory for {player_name}!", 1, ASPARAGUS)
                             label_rect = label.get_rect(center=(800 // 2, 300))
                             bg_rect = label_rect.inflate(30, 30)  # Reduced width
@@ -303,28 +368,31 @@ def play_ai_vs_player(screen, depth, player_name):
                             pygame.draw.rect(screen, (255, 215, 0), bg_rect, 8, border_radius=25)
                             screen.blit(label, label_rect)
                             pygame.display.update()
-                            if win_sound:
-                                win_sound.play()
+                            assets.play_sound("win.wav")
                             pygame.time.wait(2500)
+                            record.finish(1)
                             game_over = True
                         turn = 1
                         if not game_over:
-                            draw_board(screen, board)
+                            draw_cell(screen, board, row, col)
         if turn == 1 and not game_over:
-            import time
-            start_time = time.time()
-            col, _ = minimax(board, depth, -float('inf'), float('inf'), True, 2, start_time, heuristic_type="original")
+            if ai_move is None:
+                ai_move = BackgroundMove(board, 2, depth, **ai_options)
+            if not ai_move.done():
+                draw_thinking(screen, PINK)
+                clock.tick(60)
+                continue
+            col = ai_move.result()
+            ai_move = None
+            clear_thinking(screen)
             if col is not None and is_valid_location(board, col):
                 row = get_next_open_row(board, col)
                 drop_piece(board, row, col, 2)
-                if drop_sound:
-                    drop_sound.play()
-                if winning_move(board, 2):
+                record.move(col)
+                assets.play_sound("drop.wav")
+                if winning_move_at(board, row, col, 2):
                     draw_board(screen, board)
-                    try:
-                        font = pygame.font.Font("Game Paused DEMO.otf", 80)
-                    except pygame.error:
-                        font = pygame.font.SysFont("sans", 80)
+                    font = assets.font("Game Paused DEMO.otf", 80)
                     label = font.render("AI Conquers!", 1, PINK)
                     label_rect = label.get_rect(center=(800 // 2, 300))
                     bg_rect = label_rect.inflate(30, 30)  # Reduced width
@@ -332,25 +400,27 @@ def play_ai_vs_player(screen, depth, player_name):
                     pygame.draw.rect(screen, (255, 215, 0), bg_rect, 8, border_radius=25)
                     screen.blit(label, label_rect)
                     pygame.display.update()
-                    if win_sound:
-                        win_sound.play()
+                    assets.play_sound("win.wav")
                     pygame.time.wait(2500)
+                    record.finish(2)
                     game_over = True
                 turn = 0
                 if not game_over:
-                    draw_board(screen, board)
+                    draw_cell(screen, board, row, col)
+                    ponder = Ponder(board, 2, depth, **ai_options)
         if game_over:
             pygame.time.wait(3000)
+            record.close()
             return "main_menu"
+        clock.tick(60)
 
 
 def play_playerA_vs_playerB(screen, player_names):
-    background_image = pygame.image.load("final_back.jpeg").convert()
-    background_image = pygame.transform.scale(background_image, (800, 600))
-    print("Background image loaded successfully.")
+    background_image = assets.image("final_back.jpeg", (800, 600))
     if background_image is not None:
         screen.blit(background_image, (0, 0))
     board = create_board()
+    record = open_game_record()
     game_over = False
     turn = 0
     draw_board(screen, board)
@@ -364,11 +434,13 @@ def play_playerA_vs_playerB(screen, player_names):
 
     while not game_over:
         back_button.draw(screen)
-        pygame.display.update()
+        pygame.display.update(back_button.rect)
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
+                record.close()
                 return "quit"
             if back_button.is_clicked(event):
+                record.close()
                 return "main_menu"
             if event.type == pygame.MOUSEMOTION:
                 board_x = (800 - WIDTH) // 2
@@ -379,10 +451,11 @@ def play_playerA_vs_playerB(screen, player_names):
                         pygame.draw.circle(screen, ASPARAGUS, (posx, CELL_SIZE/2), RADIUS)
                     else:
                         pygame.draw.circle(screen, PINK, (posx, CELL_SIZE/2), RADIUS)
-                pygame.display.update()
+                pygame.display.update((board_x, 0, WIDTH, CELL_SIZE))
             if event.type == pygame.MOUSEBUTTONDOWN:
                 board_x = (800 - WIDTH) // 2
                 pygame.draw.rect(screen, BLACK, (board_x, 0, WIDTH, CELL_SIZE))
+                pygame.display.update((board_x, 0, WIDTH, CELL_SIZE))
                 posx = event.pos[0]
                 if board_x <= posx < board_x + WIDTH:
                     col = (posx - board_x) // CELL_SIZE
@@ -390,16 +463,13 @@ def play_playerA_vs_playerB(screen, player_names):
                         row = get_next_open_row(board, col)
                         player = turn + 1
                         drop_piece(board, row, col, player)
-                        if drop_sound:
-                            drop_sound.play()
-                        if winning_move(board, player):
+                        record.move(col)
+                        assets.play_sound("drop.wav")
+                        if winning_move_at(board, row, col, player):
                             draw_board(screen, board)
                             win_message = f"{player_names[player-1]} Triumphs!"
                             print(f"Win detected for {player_names[player-1]}")
-                            try:
-                                font = pygame.font.Font("Game Paused DEMO.otf", 60)  # Reduced font size
-                            except pygame.error:
-                                font = pygame.font.SysFont("sans", 60)
+                            font = assets.font("Game Paused DEMO.otf", 60)  # Reduced font size
                             label = font.render(win_message, 1, ASPARAGUS if player == 1 else PINK)
                             label_rect = label.get_rect(center=(800 // 2, 300))
                             bg_rect = label_rect.inflate(30, 30)
@@ -407,18 +477,15 @@ def play_playerA_vs_playerB(screen, player_names):
                             pygame.draw.rect(screen, (255, 215, 0), bg_rect, 8, border_radius=25)
                             screen.blit(label, label_rect)
                             pygame.display.update()
-                            if win_sound:
-                                win_sound.play()
+                            assets.play_sound("win.wav")
                             pygame.time.wait(2500)
+                            record.finish(player)
                             game_over = True
                             break
                         elif is_board_full(board):
                             draw_board(screen, board)
                             print("Game ended in a draw")
-                            try:
-                                font = pygame.font.Font("Game Paused DEMO.otf", 60)  # Reduced font size
-                            except pygame.error:
-                                font = pygame.font.SysFont("sans", 60)
+                            font = assets.font("Game Paused DEMO.otf", 60)  # Reduced font size
                             label = font.render("It's a Draw!", 1, WHITE)
                             label_rect = label.get_rect(center=(800 // 2, 300))
                             bg_rect = label_rect.inflate(30, 30)
@@ -426,26 +493,28 @@ def play_playerA_vs_playerB(screen, player_names):
                             pygame.draw.rect(screen, (255, 215, 0), bg_rect, 8, border_radius=25)
                             screen.blit(label, label_rect)
                             pygame.display.update()
-                            if draw_sound:
-                                draw_sound.play()
+                            assets.play_sound("draw.wav")
                             pygame.time.wait(2500)
+                            record.finish(0)
                             game_over = True
                             break
                         turn = 1 - turn
                         if not game_over:
-                            draw_board(screen, board)
+                            draw_cell(screen, board, row, col)
         if game_over:
             pygame.time.wait(3000)
+            record.close()
             return "main_menu"
 
 def play_ai_vs_ai(screen, depth):
-    background_image = pygame.image.load("final_back.jpeg").convert()
-    background_image = pygame.transform.scale(background_image, (800, 600))
-    print("Background image loaded successfully.")
+    background_image = assets.image("final_back.jpeg", (800, 600))
     if background_image is not None:
         screen.blit(background_image, (0, 0))
 
     board = create_board()
+    record = open_game_record()
+    # shared by both sides; keys carry the heuristic and the side scored
+    eval_cache = EvalCache()
     game_over = False
     turn = 0
     draw_board(screen, board)
@@ -457,32 +526,49 @@ def play_ai_vs_ai(screen, depth):
                 return False
         return True
 
+    ai_move = None
+    next_move_time = 0
+    clock = pygame.time.Clock()
+
     while not game_over:
         back_button.draw(screen)
-        pygame.display.update()
+        pygame.display.update(back_button.rect)
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
+                if ai_move:
+                    ai_move.cancel()
+                record.close()
                 return "quit"
             if back_button.is_clicked(event):
+                if ai_move:
+                    ai_move.cancel()
+                record.close()
                 return "main_menu"
 
-        if not game_over:
-            import time
-            start_time = time.time()
+        if not game_over and pygame.time.get_ticks() >= next_move_time:
             heuristic = "heuristic1" if turn == 0 else "heuristic2"
             piece = 1 if turn == 0 else 2
-            col, _ = minimax(board, depth, -float('inf'), float('inf'), True, piece, start_time, heuristic_type=heuristic)
+            if ai_move is None:
+                ai_move = BackgroundMove(board, piece, depth, heuristic_type=heuristic, eval_cache=eval_cache)
+            if not ai_move.done():
+                draw_thinking(screen, ASPARAGUS if piece == 1 else PINK)
+                clock.tick(60)
+                continue
+            col = ai_move.result()
+            ai_move = None
+            clear_thinking(screen)
             if col is not None and is_valid_location(board, col):
                 row = get_next_open_row(board, col)
                 drop_piece(board, row, col, piece)
-                if drop_sound:
-                    drop_sound.play()
-                draw_board(screen, board)
-                pygame.time.wait(500)
+                record.move(col)
+                assets.play_sound("drop.wav")
+                draw_cell(screen, board, row, col)
+                # pause between moves without blocking the event loop
+                next_move_time = pygame.time.get_ticks() + 500
 
-                if winning_move(board, piece):
+                if winning_move_at(board, row, col, piece):
                   
-                    font = pygame.font.SysFont("Arial", 60)
+                    font = assets.sys_font("Arial", 60)
 
                     if piece == 1:
                         win_message = "AI 1 Prevails!"
@@ -502,13 +588,13 @@ def play_ai_vs_ai(screen, depth):
                     screen.blit(label, label_rect)
                     pygame.display.update()
 
-                    if win_sound:
-                        win_sound.play()
+                    assets.play_sound("win.wav")
                     pygame.time.wait(2500)
+                    record.finish(piece)
                     game_over = True
 
                 elif is_board_full(board):
-                    font = pygame.font.SysFont("Arial", 60)
+                    font = assets.sys_font("Arial", 60)
                     label = font.render("It's a Draw!", True, WHITE)
                     label_rect = label.get_rect(center=(800 // 2, 500))
                     bg_rect = label_rect.inflate(160, 80)
@@ -517,29 +603,26 @@ def play_ai_vs_ai(screen, depth):
                     screen.blit(label, label_rect)
                     pygame.display.update()
 
-                    if draw_sound:
-                        draw_sound.play()
+                    assets.play_sound("draw.wav")
                     pygame.time.wait(2500)
+                    record.finish(0)
                     game_over = True
 
                 turn = 1 - turn
 
         if game_over:
             pygame.time.wait(3000)
+            record.close()
             return "main_menu"
+        clock.tick(60)
 
 def main():
     screen = pygame.display.set_mode((800, 600))
     pygame.display.set_caption("Connect Four")
     
-    background_image = None
-    try:
-        background_image = pygame.image.load("final_back.jpeg").convert()
-        background_image = pygame.transform.scale(background_image, (800, 600))
-        print("Background image loaded successfully.")
-    except pygame.error as e:
-        print(f"Error loading background image: {e}")
-        background_image = None
+    assets.preload_sounds(SOUNDS)
+    background_image = assets.image("final_back.jpeg", (800, 600))
+    if background_image is None:
         print("Falling back to gradient background.")
     
     start_button = Button("Start", (800 - 200) // 2, 200, 200, 60, WOOD_BROWN, GRAY, WHITE)
@@ -1,305 +1,444 @@
-import math
 import copy
+import math
 import time
+from itertools import compress
 
-def evaluate_position(board, piece):
-    score = 0
-    opponent = 2 if piece == 1 else 1
+def evaluate_position(board, piece, k=4):
     rows = len(board)
     cols = len(board[0])
-    
-    def score_window(window, player):
-        score = 0
-        opp = 2 if player == 1 else 1
-        if window.count(player) == 4:
-            score += 100000
-        elif window.count(player) == 3 and window.count(0) == 1:
-            score += 100
-        elif window.count(player) == 2 and window.count(0) == 2:
-            score += 10
-        elif window.count(player) == 1 and window.count(0) == 3:
-            score += 1
-
-        if window.count(opp) == 3 and window.count(0) == 1:
-            score -= 200  
-        elif window.count(opp) == 2 and window.count(0) == 2:
-            score -= 15
-        return score
-
-    center_col = cols // 2
-    center_array = [board[r][center_col] for r in range(rows)]
-    center_count = center_array.count(piece)
-    score += center_count * 6  
-
-    for r in range(rows):
-        if board[r][0] == piece:
-            score -= 1
-        if board[r][cols-1] == piece:
-            score -= 1
-
-    for r in range(rows):
-        for c in range(cols - 3):
-            window = [board[r][c+i] for i in range(4)]
-            score += score_window(window, piece)
-
-    for c in range(cols):
-        for r in range(rows - 3):
-            window = [board[r+i][c] for i in range(4)]
-            score += score_window(window, piece)
-
-    for r in range(rows - 3):
-        for c in range(cols - 3):
-            window = [board[r+i][c+i] for i in range(4)]
-            score += score_window(window, piece)
-
-    for r in range(3, rows):
-        for c in range(cols - 3):
-            window = [board[r-i][c+i] for i in range(4)]
-            score += score_window(window, piece)
-
-    def detect_vertical_threat(c, player):
-        for r in range(rows - 3):
-            window = [board[r+i][c] for i in range(4)]
-            if window.count(player) == 3 and window.count(0) == 1:
-                return True
-        return False
-
-    if detect_vertical_threat(0, opponent):
-        score -= 150
-    if detect_vertical_threat(cols - 1, opponent):
-        score -= 150
+    table = window_table(rows, cols, k)
+    codes = window_codes(flat_board(board), piece, k)
+    scores = code_scores(k)
+
+    # centre column bonus, edge column penalty
+    score = codes[cols // 2::cols].count(1) * 6
+    score -= codes[::cols].count(1) + codes[cols - 1::cols].count(1)
+
+    if k == 4:
+        for a, b, c, d in table.flat_windows:
+            score += scores[codes[a] + codes[b] + codes[c] + codes[d]]
+    else:
+        for window in table.flat_windows:
+            score += scores[sum(codes[i] for i in window)]
+
+    # the opponent one piece from a vertical line in an edge column
+    threat = (k - 1) * (k + 1)
+    for col in (0, cols - 1):
+        for index in table.column_windows[col]:
+            if sum(codes[i] for i in table.flat_windows[index]) == threat:
+                score -= 150
+                break
 
     return score
 
-def evaluate_heuristic1(board, piece, opponent):
-    score = 0
-    rows = len(board)
-    cols = len(board[0])
+# heuristic1's centre-out column bonus on a standard board: 200 for the
+# centre column down to 40 for the edges
+HEURISTIC1_WEIGHTS = (200, 120, 70, 40)
+_column_weights = {}
 
-    def is_square_available(board, r, c):
-        if r < 0 or r >= rows or c < 0 or c >= cols:
-            return False
-        if board[r][c] != 0:
-            return False
-        
-        if r > 0 and board[r-1][c] == 0:
-            return False
-        return True
-
-    def check_window(window, player, r_start, c_start, direction):
-        score = 0
-        if window.count(player) == 4:
-            return float('inf')
-        elif window.count(player) == 3 and window.count(0) == 1:
-            if direction == 'horizontal':
-                c = c_start + window.index(0)
-                if is_square_available(board, r_start, c-1) or is_square_available(board, r_start, c+4):
-                    return float('inf')
-                elif is_square_available(board, r_start, c):
-                    return 900000
-            elif direction == 'vertical':
-                r = r_start + window.index(0)
-                if is_square_available(board, r, c_start):
-                    return 900000
-            elif direction == 'diagonal_pos':
-                r = r_start + window.index(0)
-                c = c_start + window.index(0)
-                if is_square_available(board, r, c):
-                    return 900000
-            elif direction == 'diagonal_neg':
-                r = r_start - window.index(0)
-                c = c_start + window.index(0)
-                if is_square_available(board, r, c):
-                    return 900000
-            return 0
-        elif window.count(player) == 2 and window.count(0) == 2:
-            if direction == 'horizontal':
-                c1 = c_start + window.index(0)
-                c2 = c_start + window.index(0, window.index(0)+1)
-                if is_square_available(board, r_start, c1-1) or is_square_available(board, r_start, c2+1):
-                    return 50000
-                elif is_square_available(board, r_start, c1) or is_square_available(board, r_start, c2):
-                    return window.count(0) * 4 
-                return 0
-            elif direction == 'vertical':
-                r1 = r_start + window.index(0)
-                r2 = r_start + window.index(0, window.index(0)+1)
-                if is_square_available(board, r1, c_start) or is_square_available(board, r2, c_start):
-                    return 50000
-                return 0
-            elif direction == 'diagonal_pos':
-                r1 = r_start + window.index(0)
-                c1 = c_start + window.index(0)
-                r2 = r_start + window.index(0, window.index(0)+1)
-                c2 = c_start + window.index(0, window.index(0)+1)
-                if is_square_available(board, r1, c1) or is_square_available(board, r2, c2):
-                    return 50000
-                return 0
-            elif direction == 'diagonal_neg':
-                r1 = r_start - window.index(0)
-                c1 = c_start + window.index(0)
-                r2 = r_start - window.index(0, window.index(0)+1)
-                c2 = c_start + window.index(0, window.index(0)+1)
-                if is_square_available(board, r1, c1) or is_square_available(board, r2, c2):
-                    return 50000
-                return 0
-        return 0
-
-    for r in range(rows):
-        for c in range(cols - 3):
-            window = [board[r][c + i] for i in range(4)]
-            if window.count(piece) > 0 and window.count(opponent) == 0:
-                score += check_window(window, piece, r, c, 'horizontal')
-            elif window.count(opponent) > 0 and window.count(piece) == 0:
-                score -= check_window(window, opponent, r, c, 'horizontal')
-
-    for c in range(cols):
-        for r in range(rows - 3):
-            window = [board[r + i][c] for i in range(4)]
-            if window.count(piece) > 0 and window.count(opponent) == 0:
-                score += check_window(window, piece, r, c, 'vertical')
-            elif window.count(opponent) > 0 and window.count(piece) == 0:
-                score -= check_window(window, opponent, r, c, 'vertical')
-
-    for r in range(rows - 3):
-        for c in range(cols - 3):
-            window = [board[r + i][c + i] for i in range(4)]
-            if window.count(piece) > 0 and window.count(opponent) == 0:
-                score += check_window(window, piece, r, c, 'diagonal_pos')
-            elif window.count(opponent) > 0 and window.count(piece) == 0:
-                score -= check_window(window, opponent, r, c, 'diagonal_pos')
-
-    for r in range(3, rows):
-        for c in range(cols - 3):
-            window = [board[r - i][c + i] for i in range(4)]
-            if window.count(piece) > 0 and window.count(opponent) == 0:
-                score += check_window(window, piece, r, c, 'diagonal_neg')
-            elif window.count(opponent) > 0 and window.count(piece) == 0:
-                score -= check_window(window, opponent, r, c, 'diagonal_neg')
-
-    for r in range(rows - 3):
-        for c in range(cols - 3):
-            if r + 2 < rows and c + 2 < cols:
-                if board[r][c] == piece and board[r+1][c+1] == piece and board[r+2][c+2] == piece and board[r+3][c+3] == piece:
-                    score += 900000
-                elif board[r][c] == opponent and board[r+1][c+1] == opponent and board[r+2][c+2] == opponent and board[r+3][c+3] == opponent:
-                    score -= 900000
-    for r in range(3, rows):
-        for c in range(cols - 3):
-            if r - 2 >= 0 and c + 2 < cols:
-                if board[r][c] == piece and board[r-1][c+1] == piece and board[r-2][c+2] == piece and board[r-3][c+3] == piece:
-                    score += 900000
-                elif board[r][c] == opponent and board[r-1][c+1] == opponent and board[r-2][c+2] == opponent and board[r-3][c+3] == opponent:
-                    score -= 900000
-
-    for r in range(rows):
+def heuristic1_column_weights(cols):
+    # stretch HEURISTIC1_WEIGHTS over the distance from the centre so wider
+    # boards keep the same centre-to-edge profile
+    weights = _column_weights.get(cols)
+    if weights is None:
+        center = (cols - 1) / 2
+        steps = len(HEURISTIC1_WEIGHTS) - 1
+        weights = []
         for c in range(cols):
-            if board[r][c] == piece:
-                if c == 3:  
-                    score += 200
-                elif c in [2, 4]: 
-                    score += 120
-                elif c in [1, 5]: 
-                    score += 70
-                elif c in [0, 6]: 
-                    score += 40
-            elif board[r][c] == opponent:
-                if c == 3:
-                    score -= 200
-                elif c in [2, 4]:
-                    score -= 120
-                elif c in [1, 5]:
-                    score -= 70
-                elif c in [0, 6]:
-                    score -= 40
+            position = abs(c - center) / center * steps if center else 0
+            low = int(position)
+            high = min(low + 1, steps)
+            weights.append(round(HEURISTIC1_WEIGHTS[low] + (HEURISTIC1_WEIGHTS[high] - HEURISTIC1_WEIGHTS[low]) * (position - low)))
+        _column_weights[cols] = weights
+    return weights
 
-    return score
+# heuristic1's threat scores. The terms add up, so the total is clamped to
+# HEURISTIC1_LIMIT to keep it below the +-1000000 the search gives a won or
+# lost position.
+HEURISTIC1_LIMIT = 999999
+HEURISTIC1_LINE = 900000       # a completed line
+HEURISTIC1_UNSTOPPABLE = 400000  # two immediate threats, or one stacked on another
+HEURISTIC1_IMMEDIATE = 90000   # per threat that can be played now
+HEURISTIC1_GOOD_THREAT = 1000  # per later threat on the owner's zugzwang parity
+HEURISTIC1_THREAT = 300        # per later threat on the other parity
+
+_weight_masks = {}
 
-def evaluate_heuristic2(board, piece, opponent):
+def heuristic1_weight_masks(rows, cols):
+    # (weight, bitboard mask of every column with that weight)
+    masks = _weight_masks.get((rows, cols))
+    if masks is None:
+        stride = rows + 1
+        grouped = {}
+        for c, weight in enumerate(heuristic1_column_weights(cols)):
+            grouped[weight] = grouped.get(weight, 0) | ((1 << rows) - 1) << (c * stride)
+        masks = list(grouped.items())
+        _weight_masks[(rows, cols)] = masks
+    return masks
+
+def evaluate_heuristic1(board, piece, opponent, k=4):
+    analysis = ThreatAnalysis(board, k)
+    rows = analysis.rows
+    score = 0
+    for player, sign in ((piece, 1), (opponent, -1)):
+        if has_run(analysis.masks[player], rows + 1, k):
+            score += sign * HEURISTIC1_LINE
+        elif analysis.unstoppable(player):
+            score += sign * HEURISTIC1_UNSTOPPABLE
+        immediate = popcount(analysis.immediate[player])
+        good = popcount(analysis.good[player] & ~analysis.playable)
+        later = popcount(analysis.threats[player]) - immediate - good
+        score += sign * (immediate * HEURISTIC1_IMMEDIATE + good * HEURISTIC1_GOOD_THREAT + later * HEURISTIC1_THREAT)
+
+    for weight, columns in heuristic1_weight_masks(rows, analysis.cols):
+        score += weight * (popcount(analysis.masks[piece] & columns) - popcount(analysis.masks[opponent] & columns))
+
+    return max(-HEURISTIC1_LIMIT, min(HEURISTIC1_LIMIT, score))
+
+def evaluate_heuristic2(board, piece, opponent, k=4):
     score = 0
     rows = len(board)
     cols = len(board[0])
-    value_matrix = [
-        [3, 4, 5, 7, 5, 4, 3],
-        [4, 6, 8, 10, 8, 6, 4],
-        [5, 8, 11, 13, 11, 8, 5],
-        [5, 8, 11, 13, 11, 8, 5],
-        [4, 6, 8, 10, 8, 6, 4],
-        [3, 4, 5, 7, 5, 4, 3]
-    ]
-
-    for r in range(rows):
-        for c in range(cols):
-            if board[r][c] == piece:
-                score += value_matrix[r][c]
-            elif board[r][c] == opponent:
-                score -= value_matrix[r][c]
-
+    values = window_table(rows, cols, k).flat_values
+    flat = flat_board(board)
+    score += sum(compress(values, flat.translate(PIECE_SELECTORS[piece])))
+    score -= sum(compress(values, flat.translate(PIECE_SELECTORS[opponent])))
     return score
 
 def get_valid_locations(board):
     return [col for col in range(len(board[0])) if board[len(board)-1][col] == 0]
 
-def minimax(board, depth, alpha, beta, maximizingPlayer, piece, start_time, time_limit=2.0, heuristic_type="original"):
-    valid_locations = get_valid_locations(board)
-    is_terminal = len(valid_locations) == 0 or winning_move(board, 1) or winning_move(board, 2)
-    
+class SearchTimeout(Exception):
+    pass
+
+class SearchLimits:
+    def __init__(self, time_limit=None, node_limit=None, stop_event=None):
+        self.deadline = None if time_limit is None else time.time() + time_limit
+        self.node_limit = node_limit
+        self.stop_event = stop_event
+        self.nodes = 0
+        self.enabled = True
+
+    def check(self):
+        self.nodes += 1
+        if not self.enabled:
+            return
+        if self.node_limit is not None and self.nodes > self.node_limit:
+            raise SearchTimeout()
+        if self.deadline is not None and time.time() > self.deadline:
+            raise SearchTimeout()
+        if self.stop_event is not None and self.stop_event.is_set():
+            raise SearchTimeout()
+
+def store_result(tt, key, depth, value, alpha, beta, column, start_time, time_limit):
     if time.time() - start_time > time_limit:
-        if heuristic_type == "heuristic1":
-            return None, evaluate_heuristic1(board, piece, 2 if piece == 1 else 1)
-        elif heuristic_type == "heuristic2":
-            return None, evaluate_heuristic2(board, piece, 2 if piece == 1 else 1)
-        else:
-            return None, evaluate_position(board, piece)
-    
-    if depth == 0 or is_terminal:
-        if is_terminal:
-            if winning_move(board, piece):
-                return None, 1000000
-            elif winning_move(board, 2 if piece == 1 else 1):
-                return None, -1000000
-            else:
-                return None, 0
-        if heuristic_type == "heuristic1":
-            return None, evaluate_heuristic1(board, piece, 2 if piece == 1 else 1)
-        elif heuristic_type == "heuristic2":
-            return None, evaluate_heuristic2(board, piece, 2 if piece == 1 else 1)
-        else:
-            return None, evaluate_position(board, piece)
-    
+        return
+    if value <= alpha:
+        flag = UPPER
+    elif value >= beta:
+        flag = LOWER
+    else:
+        flag = EXACT
+    tt.store(key, depth, value, flag, column)
+
+def evaluate_leaf(board, piece, heuristic_type, evaluator=None, stats=None, k=4, cache=None, key=None):
+    # key is the position's search key for piece to move, if the caller has
+    # it. The incremental evaluator's score is cheaper than a cache lookup,
+    # so the cache is only used for the full evaluators.
+    if cache is not None and evaluator is None:
+        if key is None:
+            key = search_key(board, piece, True, heuristic_type)
+        key = canonical_key(key)[0]
+        value = cache.get(key)
+        if stats is not None:
+            stats.eval_cache_lookup(value is not None)
+        if value is None:
+            value = evaluate_leaf(board, piece, heuristic_type, evaluator, stats, k)
+            cache.put(key, value)
+        return value
+    if stats is not None:
+        start = time.perf_counter()
+        value = evaluate_leaf(board, piece, heuristic_type, evaluator, None, k)
+        stats.evaluation(heuristic_type, time.perf_counter() - start)
+        return value
+    if heuristic_type == "heuristic1":
+        return evaluate_heuristic1(board, piece, 2 if piece == 1 else 1, k)
+    elif heuristic_type == "heuristic2":
+        return evaluate_heuristic2(board, piece, 2 if piece == 1 else 1, k)
+    elif evaluator is not None:
+        return evaluator.score()
+    else:
+        return evaluate_position(board, piece, k)
+
+class SearchContext:
+    # Everything that stays the same for a whole search. negamax passes it
+    # down unchanged; only the board, depth, window, side to move, ply, key,
+    # last move and pv list change from node to node. piece is the side the
+    # search is for, which the evaluation and the table keys are relative to.
+    def __init__(self, piece, heuristic_type="original", start_time=None, time_limit=math.inf, tt=None, limits=None,
+                 evaluator=None, ordering=None, stats=None, k=4, pvs=True, eval_cache=None):
+        self.piece = piece
+        self.heuristic_type = heuristic_type
+        self.start_time = time.time() if start_time is None else start_time
+        self.time_limit = time_limit
+        self.tt = tt
+        self.limits = limits
+        self.evaluator = evaluator
+        self.ordering = ordering
+        self.stats = stats
+        self.k = k
+        self.pvs = pvs
+        self.eval_cache = eval_cache
+
+def minimax(board, depth, alpha, beta, maximizingPlayer, piece, start_time, time_limit=2.0, heuristic_type="original", *,
+            tt=None, key=None, limits=None, evaluator=None, ordering=None, ply=0, stats=None, k=4, last_move=None, pvs=True,
+            eval_cache=None):
+    # piece's score with piece to move (maximizing) or its opponent to move
+    context = SearchContext(piece, heuristic_type, start_time, time_limit, tt, limits, evaluator, ordering, stats, k, pvs,
+                            eval_cache)
     if maximizingPlayer:
-        value = -math.inf
-        column = valid_locations[0] if valid_locations else None
-        for col in valid_locations:
-            row = get_next_open_row(board, col)
-            if row == -1:
-                continue
-            board_copy = copy.deepcopy(board)
-            drop_piece(board_copy, row, col, piece)
-            _, new_score = minimax(board_copy, depth-1, alpha, beta, False, piece, start_time, time_limit, heuristic_type)
-            if new_score > value:
-                value = new_score
-                column = col
-            alpha = max(alpha, value)
-            if alpha >= beta:
-                break
-        return column, value
+        return negamax(board, depth, alpha, beta, piece, context, ply, key, last_move)
+    column, value = negamax(board, depth, -beta, -alpha, 2 if piece == 1 else 1, context, ply, key, last_move)
+    return column, -value
+
+def negamax(board, depth, alpha, beta, mover, context, ply=0, key=None, last_move=None, pv=None):
+    # Scores are from mover's point of view. With context.pvs, every child
+    # after the first is searched with a null window just above alpha and
+    # only re-searched when it beats alpha. A pv list is filled with the
+    # best line from here.
+    piece = context.piece
+    tt = context.tt
+    evaluator = context.evaluator
+    stats = context.stats
+    k = context.k
+    if context.limits is not None:
+        context.limits.check()
+    if stats is not None:
+        stats.node(ply)
+    sign = 1 if mover == piece else -1
+    valid_locations = get_valid_locations(board)
+    # below the root only the piece just dropped at last_move can have won
+    if last_move is None:
+        winner = 1 if winning_move(board, 1, k) else 2 if winning_move(board, 2, k) else 0
     else:
-        value = math.inf
-        column = valid_locations[0] if valid_locations else None
-        for col in valid_locations:
-            row = get_next_open_row(board, col)
-            if row == -1:
-                continue
-            board_copy = copy.deepcopy(board)
-            drop_piece(board_copy, row, col, 2 if piece == 1 else 1)
-            _, new_score = minimax(board_copy, depth-1, alpha, beta, True, piece, start_time, time_limit, heuristic_type)
-            if new_score < value:
-                value = new_score
-                column = col
-            beta = min(beta, value)
-            if alpha >= beta:
+        row, col = last_move
+        winner = board[row][col] if winning_move_at(board, row, col, board[row][col], k) else 0
+    is_terminal = len(valid_locations) == 0 or winner != 0
+
+    timed_out = time.time() - context.start_time > context.time_limit
+    if timed_out and stats is not None:
+        stats.time_cutoffs += 1
+
+    if is_terminal and not timed_out:
+        if winner == mover:
+            return None, 1000000
+        elif winner != 0:
+            return None, -1000000
+        else:
+            return None, 0
+    if depth == 0 or timed_out:
+        leaf_key = key
+        if context.eval_cache is not None and evaluator is None and key is not None and mover != piece:
+            # evaluations don't depend on the side to move
+            leaf_key = key ^ key_tables(len(board), len(board[0]), context.heuristic_type)[1]
+        return None, sign * evaluate_leaf(board, piece, context.heuristic_type, evaluator, stats, k, context.eval_cache, leaf_key)
+
+    tt_move = None
+    if tt is not None:
+        if key is None:
+            key = search_key(board, piece, mover == piece, context.heuristic_type)
+        cols = len(board[0])
+        zobrist, side_key = key_tables(len(board), cols, context.heuristic_type)
+        # mirrored positions share an entry; their moves are stored flipped
+        table_key, mirrored = canonical_key(key)
+        entry = tt.probe(table_key)
+        if entry is not None:
+            entry_depth, entry_value, flag, tt_move = entry
+            if mirrored and tt_move is not None:
+                tt_move = cols - 1 - tt_move
+            if entry_depth >= depth:
+                if flag == EXACT:
+                    if pv is not None and tt_move is not None:
+                        pv[:] = [tt_move]
+                    return tt_move, entry_value
+                elif flag == LOWER:
+                    alpha = max(alpha, entry_value)
+                else:
+                    beta = min(beta, entry_value)
+                if alpha >= beta:
+                    return tt_move, entry_value
+        alpha_start, beta_start = alpha, beta
+        if is_symmetric_key(key):
+            # both halves of the tree are the same, search only one
+            valid_locations = [col for col in valid_locations if col <= cols - 1 - col]
+            if tt_move is not None:
+                tt_move = min(tt_move, cols - 1 - tt_move)
+
+    ordering = context.ordering
+    if ordering is not None:
+        valid_locations = ordering.order(board, valid_locations, ply, tt_move, mover)
+    elif tt_move in valid_locations:
+        valid_locations.remove(tt_move)
+        valid_locations.insert(0, tt_move)
+
+    opponent = 2 if mover == 1 else 1
+    value = -math.inf
+    column = valid_locations[0] if valid_locations else None
+    for index, col in enumerate(valid_locations):
+        row = get_next_open_row(board, col)
+        if row == -1:
+            continue
+        drop_piece(board, row, col, mover)
+        if evaluator is not None:
+            evaluator.add(row, col, mover)
+        child_key = None if tt is None else key ^ zobrist[row][col][mover] ^ side_key
+        child_pv = None if pv is None else []
+        if index == 0 or not context.pvs:
+            _, score = negamax(board, depth-1, -beta, -alpha, opponent, context, ply+1, child_key, (row, col), child_pv)
+        else:
+            _, score = negamax(board, depth-1, -alpha-1, -alpha, opponent, context, ply+1, child_key, (row, col))
+            if alpha < -score < beta:
+                if stats is not None:
+                    stats.researches += 1
+                _, score = negamax(board, depth-1, -beta, -alpha, opponent, context, ply+1, child_key, (row, col), child_pv)
+        score = -score
+        remove_piece(board, row, col)
+        if evaluator is not None:
+            evaluator.remove(row, col, mover)
+        if score > value:
+            value = score
+            column = col
+            if pv is not None:
+                pv[:] = [col] + (child_pv or [])
+        alpha = max(alpha, value)
+        if alpha >= beta:
+            if ordering is not None:
+                ordering.cutoff(board, col, ply, depth, mover, index)
+            if stats is not None:
+                stats.cutoff(index)
+            break
+    if tt is not None:
+        stored = cols - 1 - column if mirrored and column is not None else column
+        store_result(tt, table_key, depth, value, alpha_start, beta_start, stored, context.start_time, context.time_limit)
+    return column, value
+
+def principal_variation(board, piece, heuristic_type, tt, max_length, k=4, moves=()):
+    # follows the table's best moves, after first playing moves (e.g. the
+    # part of the line the search itself reported)
+    board = copy.deepcopy(board)
+    key = search_key(board, piece, True, heuristic_type)
+    cols = len(board[0])
+    zobrist, side_key = key_tables(len(board), cols, heuristic_type)
+    pv = []
+    turn = piece
+    moves = list(moves)
+    while len(pv) < max_length:
+        if moves:
+            col = moves.pop(0)
+        else:
+            table_key, mirrored = canonical_key(key)
+            entry = tt.probe(table_key)
+            if entry is None or entry[3] is None:
                 break
-        return column, value
+            col = cols - 1 - entry[3] if mirrored else entry[3]
+        row = get_next_open_row(board, col)
+        if row == -1:
+            break
+        drop_piece(board, row, col, turn)
+        pv.append(col)
+        if winning_move_at(board, row, col, turn, k):
+            break
+        key ^= zobrist[row][col][turn] ^ side_key
+        turn = 2 if turn == 1 else 1
+    return pv
+
+def table_move(board, piece, maximizingPlayer, heuristic_type, tt):
+    # the table's best move for the position, or None; with
+    # maximizingPlayer False this is the move the search expects from
+    # piece's opponent
+    table_key, mirrored = canonical_key(search_key(board, piece, maximizingPlayer, heuristic_type))
+    entry = tt.probe(table_key)
+    if entry is None or entry[3] is None:
+        return None
+    return len(board[0]) - 1 - entry[3] if mirrored else entry[3]
+
+# Half-width of the first aspiration window, in each heuristic's own points.
+# Scores swing between odd and even depths, so the window is centred on the
+# score from two iterations back rather than the last one.
+ASPIRATION_WINDOWS = {"original": 50, "heuristic1": 200, "heuristic2": 50}
+
+def iterative_deepening(board, piece, depth=None, time_limit=None, node_limit=None, heuristic_type="original", tt=None, info=None, stop_event=None, ordering=None, stats=None, k=4, pvs=True, aspiration=True, eval_cache=None):
+    if depth is None and time_limit is None and node_limit is None:
+        raise ValueError("iterative_deepening needs a depth, time_limit or node_limit")
+    start_time = time.time()
+    search_board = copy.deepcopy(board)
+    if tt is None:
+        tt = TranspositionTable()
+    tt.new_search()
+    limits = SearchLimits(time_limit, node_limit, stop_event)
+    if ordering is None:
+        ordering = MoveOrdering(cols=len(board[0]))
+    evaluator = IncrementalEvaluator(search_board, piece, k) if heuristic_type == "original" else None
+    empty = sum(row.count(0) for row in map(list, board))
+    max_depth = empty if depth is None else min(depth, empty)
+
+    context = SearchContext(piece, heuristic_type, start_time, math.inf, tt, limits, evaluator, ordering, stats, k, pvs,
+                            eval_cache)
+    column, value = None, None
+    scores = {}
+    pv = []
+    completed = 0
+    for current_depth in range(1, max_depth + 1):
+        # depth 1 always runs to completion so there is a legal move to return
+        limits.enabled = current_depth > 1
+        nodes_before = limits.nodes
+        # search a window around the expected score and open up whichever
+        # side the result falls outside of; won and lost scores get the full
+        # window
+        guess = scores.get(current_depth - 2)
+        if aspiration and guess is not None and abs(guess) < 1000000:
+            window = ASPIRATION_WINDOWS[heuristic_type]
+            alpha, beta = guess - window, guess + window
+        else:
+            alpha, beta = -math.inf, math.inf
+        try:
+            while True:
+                line = []
+                result = negamax(search_board, current_depth, alpha, beta, piece, context, pv=line)
+                if result[1] <= alpha:
+                    alpha = -math.inf
+                elif result[1] >= beta:
+                    beta = math.inf
+                else:
+                    break
+                if stats is not None:
+                    stats.aspiration_researches += 1
+        except SearchTimeout:
+            if stats is not None:
+                stats.aborted_iterations += 1
+            break
+        column, value = result
+        scores[current_depth] = value
+        pv = line
+        completed = current_depth
+        if stats is not None:
+            stats.iteration_nodes[current_depth] = limits.nodes - nodes_before
+
+    if info is not None:
+        info["depth"] = completed
+        info["nodes"] = limits.nodes
+        info["time"] = time.time() - start_time
+        # the search's own line, carried on from the table where it stopped
+        # at a table hit
+        info["pv"] = principal_variation(board, piece, heuristic_type, tt, completed, k, pv)
+        if stats is not None:
+            info["stats"] = stats.report()
+    return column, value
 
-from board import winning_move, get_next_open_row, drop_piece
\ No newline at end of file
+from board import winning_move, winning_move_at, get_next_open_row, drop_piece, remove_piece
+from evaluator import IncrementalEvaluator, code_scores
+from move_ordering import MoveOrdering
+from windows import PIECE_SELECTORS, flat_board, window_codes, window_table
+from threats import ThreatAnalysis, popcount
+from bitboard import has_run
+from transposition import EXACT, LOWER, UPPER, TranspositionTable, canonical_key, is_symmetric_key, key_tables, search_key
\ No newline at end of file
@@ -0,0 +1,66 @@
+from board import get_next_open_row
+
+STRATEGIES = ("center", "tt", "killer", "history")
+
+def center_order(cols):
+    center = (cols - 1) / 2
+    return sorted(range(cols), key=lambda col: abs(col - center))
+
+class MoveOrdering:
+    # Orders minimax children: transposition-table move, then this ply's
+    # killer moves, then the rest by history score, centre-out among equals.
+    # Any subset of STRATEGIES can be switched on to compare their effect.
+    def __init__(self, strategies=STRATEGIES, cols=7, max_ply=64):
+        unknown = set(strategies) - set(STRATEGIES)
+        if unknown:
+            raise ValueError(f"unknown move ordering strategies: {sorted(unknown)}")
+        self.strategies = tuple(strategies)
+        self.use_center = "center" in strategies
+        self.use_tt = "tt" in strategies
+        self.use_killers = "killer" in strategies
+        self.use_history = "history" in strategies
+        self.cols = cols
+        self.rank = {col: i for i, col in enumerate(center_order(cols) if self.use_center else range(cols))}
+        self.killers = [[None, None] for _ in range(max_ply)]
+        self.history = {1: {}, 2: {}}
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+
+    def order(self, board, valid_locations, ply, tt_move, piece):
+        first = []
+        if self.use_tt and tt_move in valid_locations:
+            first.append(tt_move)
+        if self.use_killers and ply < len(self.killers):
+            for killer in self.killers[ply]:
+                if killer in valid_locations and killer not in first:
+                    first.append(killer)
+
+        rest = [col for col in valid_locations if col not in first]
+        if self.use_history:
+            history = self.history[piece]
+            rows = {col: get_next_open_row(board, col) for col in rest}
+            rest.sort(key=lambda col: (-history.get((rows[col], col), 0), self.rank[col]))
+        elif self.use_center:
+            rest.sort(key=self.rank.__getitem__)
+        return first + rest
+
+    def cutoff(self, board, col, ply, depth, piece, index):
+        self.cutoffs += 1
+        if index == 0:
+            self.first_move_cutoffs += 1
+        if self.use_killers and ply < len(self.killers):
+            killers = self.killers[ply]
+            if killers[0] != col:
+                killers[1] = killers[0]
+                killers[0] = col
+        if self.use_history:
+            # called after the move is taken back, so the open row is its cell
+            cell = (get_next_open_row(board, col), col)
+            self.history[piece][cell] = self.history[piece].get(cell, 0) + depth * depth
+
+    def stats(self):
+        return {
+            "strategies": list(self.strategies),
+            "cutoffs": self.cutoffs,
+            "first_move_cutoff_rate": self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0,
+        }
@@ -0,0 +1,104 @@
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from board import drop_piece, get_next_open_row, is_mirror_symmetric, winning_move
+from evaluator import IncrementalEvaluator
+from minimaxAI import get_valid_locations, minimax
+from transposition import TranspositionTable, symmetric_heuristic
+
+WORKER_TT_MB = 16
+CENTER_FIRST = [3, 2, 4, 1, 5, 0, 6]
+
+# per-process state, set up by init_worker
+_best_score = None
+_worker_tt = None
+_search_id = None
+
+def init_worker(best_score):
+    global _best_score, _worker_tt
+    _best_score = best_score
+    _worker_tt = TranspositionTable(WORKER_TT_MB)
+
+def search_root_move(board, col, depth, piece, heuristic_type, search_id):
+    global _search_id
+    if search_id != _search_id:
+        # Entries left by an earlier search can come from another heuristic
+        # or a deeper search, and would change this one's result. Each
+        # search starts with an empty table; its root moves share it.
+        _worker_tt.clear()
+        _search_id = search_id
+
+    row = get_next_open_row(board, col)
+    drop_piece(board, row, col, piece)
+
+    # Search just below the best root score any worker has proven so far.
+    # Scores are integers, so a move that ties or beats it still comes back
+    # exact, and worse moves are cut off early.
+    best = _best_score.value
+    alpha = best - 1 if math.isfinite(best) else -math.inf
+
+    evaluator = IncrementalEvaluator(board, piece) if heuristic_type == "original" else None
+    _, value = minimax(board, depth - 1, alpha, math.inf, False, piece, time.time(), math.inf, heuristic_type, tt=_worker_tt,
+                       evaluator=evaluator, last_move=(row, col))
+
+    with _best_score.get_lock():
+        if value > _best_score.value:
+            _best_score.value = value
+    return col, value
+
+class ParallelSearch:
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.best_score = multiprocessing.Value('d', -math.inf)
+        self.executor = ProcessPoolExecutor(self.workers, initializer=init_worker, initargs=(self.best_score,))
+        self.searches = 0
+        self.futures = {}
+
+    def search(self, board, depth, piece, heuristic_type="original"):
+        valid_locations = get_valid_locations(board)
+        if depth == 0 or len(valid_locations) <= 1 or winning_move(board, 1) or winning_move(board, 2):
+            return minimax(board, depth, -math.inf, math.inf, True, piece, time.time(), math.inf, heuristic_type)
+
+        with self.best_score.get_lock():
+            self.best_score.value = -math.inf
+        order = [col for col in CENTER_FIRST if col in valid_locations]
+        order += [col for col in valid_locations if col not in order]
+        cols = len(board[0])
+        mirrored = symmetric_heuristic(heuristic_type, cols) and is_mirror_symmetric(board)
+        if mirrored:
+            # a move and its mirror image score the same; search one of each pair
+            order = [col for col in order if col <= cols - 1 - col]
+        self.searches += 1
+        self.futures = {col: self.executor.submit(search_root_move, board, col, depth, piece, heuristic_type, self.searches)
+                        for col in order}
+        results = {col: future.result()[1] for col, future in self.futures.items()}
+        if mirrored:
+            results.update({cols - 1 - col: value for col, value in list(results.items())})
+
+        # same selection as the maximizing loop in minimax
+        value = -math.inf
+        column = valid_locations[0]
+        for col in valid_locations:
+            if results[col] > value:
+                value = results[col]
+                column = col
+        return column, value
+
+    def close(self):
+        # drop root moves that haven't started, e.g. after an interrupt
+        for future in self.futures.values():
+            future.cancel()
+        self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def parallel_minimax(board, depth, piece, heuristic_type="original", workers=None):
+    with ParallelSearch(workers) as search:
+        return search.search(board, depth, piece, heuristic_type)
@@ -0,0 +1,72 @@
+from collections import defaultdict
+
+class SearchStats:
+    # Collected by minimax when passed as stats=...; with stats=None the
+    # search skips all of this.
+    def __init__(self):
+        self.nodes_by_ply = []
+        self.cutoffs = 0
+        self.cutoffs_by_index = defaultdict(int)
+        self.eval_calls = defaultdict(int)
+        self.eval_time = defaultdict(float)
+        self.eval_cache_hits = 0
+        self.eval_cache_misses = 0
+        self.time_cutoffs = 0
+        self.researches = 0
+        self.aspiration_researches = 0
+        self.aborted_iterations = 0
+        self.iteration_nodes = {}
+
+    def node(self, ply):
+        while len(self.nodes_by_ply) <= ply:
+            self.nodes_by_ply.append(0)
+        self.nodes_by_ply[ply] += 1
+
+    def cutoff(self, index):
+        self.cutoffs += 1
+        self.cutoffs_by_index[index] += 1
+
+    def evaluation(self, heuristic_type, seconds):
+        self.eval_calls[heuristic_type] += 1
+        self.eval_time[heuristic_type] += seconds
+
+    def eval_cache_lookup(self, hit):
+        if hit:
+            self.eval_cache_hits += 1
+        else:
+            self.eval_cache_misses += 1
+
+    def eval_cache_hit_rate(self):
+        lookups = self.eval_cache_hits + self.eval_cache_misses
+        return self.eval_cache_hits / lookups if lookups else 0.0
+
+    @property
+    def nodes(self):
+        return sum(self.nodes_by_ply)
+
+    def effective_branching_factor(self):
+        # geometric mean growth from one ply to the next
+        plies = [count for count in self.nodes_by_ply if count]
+        if len(plies) < 2:
+            return 0.0
+        return (plies[-1] / plies[0]) ** (1 / (len(plies) - 1))
+
+    def report(self):
+        return {
+            "nodes": self.nodes,
+            "nodes_by_ply": list(self.nodes_by_ply),
+            "cutoffs": self.cutoffs,
+            "cutoffs_by_index": dict(sorted(self.cutoffs_by_index.items())),
+            "first_child_cutoff_rate": self.cutoffs_by_index.get(0, 0) / self.cutoffs if self.cutoffs else 0.0,
+            "eval_calls": dict(self.eval_calls),
+            "eval_time": dict(self.eval_time),
+            "eval_cache_hits": self.eval_cache_hits,
+            "eval_cache_misses": self.eval_cache_misses,
+            "eval_cache_hit_rate": self.eval_cache_hit_rate(),
+            "time_cutoffs": self.time_cutoffs,
+            "researches": self.researches,
+            "aspiration_researches": self.aspiration_researches,
+            "aborted_iterations": self.aborted_iterations,
+            "iteration_nodes": dict(self.iteration_nodes),
+            "effective_branching_factor": self.effective_branching_factor(),
+        }
@@ -0,0 +1,380 @@
+import argparse
+import asyncio
+import json
+import os
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from board import create_board, drop_piece, get_next_open_row, is_valid_location, winning_move
+from evalcache import EvalCache
+from gamerecord import MOVE_CHARS, MOVE_INDEX, decode_position
+from minimaxAI import iterative_deepening
+from search_stats import SearchStats
+from transposition import TranspositionTable
+
+# Headless analysis server. Requests are JSON objects, e.g.
+#   {"moves": "3342", "heuristic": "heuristic2", "depth": 8, "time": 0.5}
+#   {"position": 1234567, "rows": 6, "cols": 7, "stats": true}
+# sent either as the body of POST /analyze or one per line on a plain TCP
+# connection. A JSON list of requests gets a list of results. Each result
+# has the best move, its score, the PV, the depth reached, nodes and time.
+#
+# Connections are handled on one asyncio loop; searches run in a process
+# pool. Requests that arrive while every worker is busy queue up and go to
+# the next free worker together as one job, and each worker keeps its
+# transposition table and evaluation cache between jobs.
+
+HEURISTICS = ("original", "heuristic1", "heuristic2")
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_DEPTH = 8
+DEFAULT_TIME = 1.0
+MAX_TIME = 60.0
+# move strings have one character per column
+MAX_SIZE = len(MOVE_CHARS)
+# most requests handed to a worker as one job, and how long to wait for more
+# once the first one is in
+BATCH_SIZE = 8
+BATCH_WINDOW = 0.002
+WORKER_TT_MB = 64
+WORKER_EVAL_CACHE_MB = 16
+MAX_BODY_BYTES = 1 << 20
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large"}
+
+# per-process state, set up by init_worker
+_table_sizes = None
+_worker_tables = {}
+
+def init_worker(tt_mb, eval_cache_mb):
+    global _table_sizes
+    _table_sizes = (tt_mb, eval_cache_mb)
+
+def worker_tables(k):
+    # (table, evaluation cache) for connect-k requests; keys don't include
+    # k, so each connect length gets its own pair
+    tables = _worker_tables.get(k)
+    if tables is None:
+        tt_mb, eval_cache_mb = _table_sizes
+        tables = (TranspositionTable(tt_mb), EvalCache(size_mb=eval_cache_mb))
+        _worker_tables[k] = tables
+    return tables
+
+def board_from_request_moves(text, rows, cols):
+    board = create_board(rows, cols)
+    piece = 1
+    for char in text:
+        col = MOVE_INDEX.get(char)
+        if col is None or col >= cols or not is_valid_location(board, col):
+            raise ValueError(f"illegal move {char!r} in {text!r}")
+        drop_piece(board, get_next_open_row(board, col), col, piece)
+        piece = 3 - piece
+    return board, piece
+
+def board_from_request_position(key, rows, cols):
+    if isinstance(key, str):
+        key = int(key, 0)
+    elif not isinstance(key, int) or isinstance(key, bool):
+        raise ValueError("position must be an integer or a string holding one")
+    stride = rows + 1
+    if key < 0 or key >> (stride * cols):
+        raise ValueError(f"position {key} does not fit a {rows}x{cols} board")
+    for col in range(cols):
+        # every column needs its marker bit
+        if not key >> (col * stride) & ((1 << stride) - 1):
+            raise ValueError(f"position {key} has no marker in column {col}")
+    board, piece = decode_position(key, rows, cols)
+    return board.to_list(), piece
+
+def parse_request(data, received):
+    # checks a request and turns it into what a worker searches; raises
+    # ValueError with a message for the client
+    if not isinstance(data, dict):
+        raise ValueError("a request must be a JSON object")
+    try:
+        rows = int(data.get("rows", 6))
+        cols = int(data.get("cols", 7))
+        k = int(data.get("connect", 4))
+        depth = data.get("depth", DEFAULT_DEPTH)
+        depth = None if depth is None else int(depth)
+        budget = float(data.get("time", DEFAULT_TIME))
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError("rows, cols, connect, depth and time must be numbers")
+    if not (1 <= rows <= MAX_SIZE and 1 <= cols <= MAX_SIZE):
+        raise ValueError(f"rows and cols must be between 1 and {MAX_SIZE}")
+    if not 2 <= k <= max(rows, cols):
+        raise ValueError(f"no connect {k} game on a {rows}x{cols} board")
+    if depth is not None and depth < 1:
+        raise ValueError("depth must be at least 1")
+    if not 0 < budget <= MAX_TIME:
+        raise ValueError(f"time must be in (0, {MAX_TIME:g}] seconds")
+    heuristic_type = data.get("heuristic", "original")
+    if heuristic_type not in HEURISTICS:
+        raise ValueError(f"heuristic must be one of {', '.join(HEURISTICS)}")
+
+    if "moves" in data:
+        board, piece = board_from_request_moves(str(data["moves"]), rows, cols)
+    elif "position" in data:
+        board, piece = board_from_request_position(data["position"], rows, cols)
+    else:
+        raise ValueError("a request needs moves or position")
+    if winning_move(board, 1, k) or winning_move(board, 2, k) or all(cell != 0 for cell in board[-1]):
+        raise ValueError("the game is already over")
+    return {
+        "board": board,
+        "piece": piece,
+        "k": k,
+        "depth": depth,
+        "heuristic_type": heuristic_type,
+        # the budget counts from arrival, so time spent queued comes out of it
+        "deadline": received + budget,
+        "stats": bool(data.get("stats", False)),
+    }
+
+def analyze(request):
+    tt, eval_cache = worker_tables(request["k"])
+    stats = SearchStats() if request["stats"] else None
+    info = {}
+    time_limit = max(request["deadline"] - time.time(), 0.0)
+    col, score = iterative_deepening(request["board"], request["piece"], request["depth"], time_limit=time_limit,
+                                     heuristic_type=request["heuristic_type"], tt=tt, info=info, stats=stats,
+                                     k=request["k"], eval_cache=eval_cache)
+    result = {"move": col, "score": score, "pv": info["pv"], "depth": info["depth"],
+              "nodes": info["nodes"], "time": info["time"]}
+    if stats is not None:
+        result["stats"] = info["stats"]
+    return result
+
+def analyze_batch(requests):
+    # one pool job; a failing request doesn't take the rest down with it
+    results = []
+    for request in requests:
+        try:
+            results.append(analyze(request))
+        except Exception as e:
+            results.append({"error": f"search failed: {e}"})
+    return results
+
+class AnalysisServer:
+    def __init__(self, workers=None, tt_mb=WORKER_TT_MB, eval_cache_mb=WORKER_EVAL_CACHE_MB,
+                 batch_size=BATCH_SIZE, batch_window=BATCH_WINDOW):
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.executor = ProcessPoolExecutor(self.workers, initializer=init_worker, initargs=(tt_mb, eval_cache_mb))
+        self.requests = 0
+        self.batches = 0
+        # created in start(), on the loop that serves them
+        self.queue = None
+        self.idle = None
+        self.dispatcher = None
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        # Start the workers before accepting connections. A forked worker
+        # inherits every open socket, and a client whose socket lives on in
+        # a worker never sees the connection close. Setting up the connect 4
+        # tables is a useful first job.
+        await asyncio.get_running_loop().run_in_executor(self.executor, worker_tables, 4)
+        self.queue = asyncio.Queue()
+        self.idle = asyncio.Semaphore(self.workers)
+        self.dispatcher = asyncio.ensure_future(self.dispatch())
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    def close(self):
+        if self.dispatcher is not None:
+            self.dispatcher.cancel()
+        self.executor.shutdown()
+
+    async def next_batch(self):
+        loop = asyncio.get_running_loop()
+        batch = [await self.queue.get()]
+        deadline = loop.time() + self.batch_window
+        while len(batch) < self.batch_size:
+            if not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def dispatch(self):
+        # one job per free worker, so requests that arrive while every
+        # worker is busy are batched together instead of queueing in the pool
+        loop = asyncio.get_running_loop()
+        while True:
+            await self.idle.acquire()
+            batch = await self.next_batch()
+            self.batches += 1
+            job = loop.run_in_executor(self.executor, analyze_batch, [request for request, _ in batch])
+            job.add_done_callback(lambda job, batch=batch: self.deliver(batch, job))
+
+    def deliver(self, batch, job):
+        self.idle.release()
+        try:
+            results = job.result()
+        except Exception as e:
+            results = [{"error": f"worker failed: {e}"}] * len(batch)
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def search(self, data, received):
+        try:
+            request = parse_request(data, received)
+        except ValueError as e:
+            return {"error": str(e)}
+        self.requests += 1
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((request, future))
+        result = await future
+        if isinstance(data.get("id"), (str, int)):
+            result = dict(result, id=data["id"])
+        return result
+
+    async def answer(self, body):
+        # result for a JSON body: one request or a list of them
+        received = time.time()
+        try:
+            data = json.loads(body)
+        except ValueError as e:
+            return {"error": f"invalid JSON: {e}"}
+        if isinstance(data, list):
+            return list(await asyncio.gather(*(self.search(item, received) for item in data)))
+        return await self.search(data, received)
+
+    def status(self):
+        return {
+            "workers": self.workers,
+            "requests": self.requests,
+            "batches": self.batches,
+            "queued": self.queue.qsize(),
+            "mean_batch": self.requests / self.batches if self.batches else 0.0,
+        }
+
+    async def handle_connection(self, reader, writer):
+        try:
+            line = await reader.readline()
+            if line.lstrip().startswith((b"{", b"[")):
+                await self.serve_lines(line, reader, writer)
+            else:
+                while line and await self.serve_http(line, reader, writer):
+                    line = await reader.readline()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve_lines(self, line, reader, writer):
+        # one request per line; lines are searched concurrently and answered
+        # in the order they came in
+        pending = asyncio.Queue()
+
+        async def send():
+            while True:
+                task = await pending.get()
+                if task is None:
+                    return
+                writer.write(json.dumps(await task).encode() + b"\n")
+                await writer.drain()
+
+        sender = asyncio.ensure_future(send())
+        while line:
+            if line.strip():
+                pending.put_nowait(asyncio.ensure_future(self.answer(line)))
+            line = await reader.readline()
+        pending.put_nowait(None)
+        await sender
+
+    async def serve_http(self, request_line, reader, writer):
+        # answers one HTTP request; returns whether to keep the connection
+        parts = request_line.decode("latin-1").split()
+        if len(parts) != 3:
+            return False
+        method, path, version = parts
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.respond(writer, 400, {"error": "Content-Length must be a non-negative integer"}, False)
+            await writer.drain()
+            return False
+        if length > MAX_BODY_BYTES:
+            self.respond(writer, 413, {"error": f"body over {MAX_BODY_BYTES} bytes"}, False)
+            await writer.drain()
+            return False
+        body = await reader.readexactly(length) if length else b""
+
+        path = path.split("?", 1)[0]
+        if path == "/analyze":
+            if method != "POST":
+                status, result = 405, {"error": "use POST"}
+            else:
+                result = await self.answer(body)
+                status = 400 if isinstance(result, dict) and "error" in result else 200
+        elif path == "/health":
+            status, result = 200, self.status()
+        else:
+            status, result = 404, {"error": f"no such path {path}"}
+        self.respond(writer, status, result, keep_alive)
+        await writer.drain()
+        return keep_alive
+
+    def respond(self, writer, status, result, keep_alive):
+        body = json.dumps(result).encode()
+        head = (f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+
+async def serve(host, port, server):
+    listener = await server.start(host, port)
+    print(f"Listening on {host}:{port} with {server.workers} workers")
+    # stop on SIGTERM as on Ctrl-C, so the pool's workers exit too
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, listener.close)
+    except NotImplementedError:
+        pass
+    try:
+        async with listener:
+            await listener.serve_forever()
+    except asyncio.CancelledError:
+        pass
+    finally:
+        server.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Connect Four analysis server")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--tt-mb", type=int, default=WORKER_TT_MB, help="transposition table size per worker")
+    parser.add_argument("--eval-cache-mb", type=int, default=WORKER_EVAL_CACHE_MB, help="evaluation cache size per worker")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="most requests sent to a worker as one job")
+    parser.add_argument("--batch-window", type=float, default=BATCH_WINDOW * 1000, help="ms to wait for more requests to batch")
+    args = parser.parse_args()
+
+    server = AnalysisServer(args.workers, args.tt_mb, args.eval_cache_mb, args.batch_size, args.batch_window / 1000)
+    try:
+        asyncio.run(serve(args.host, args.port, server))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+import time
+
+from bitboard import Board
+from minimaxAI import SearchTimeout
+from transposition import LOWER, UPPER, TranspositionTable
+
+# Exact solver for the standard 6x7 game, in the style of Pascal Pons'
+# bitboard solver. A position is (current, mask, moves): the side to move's
+# pieces, all pieces, and the number of moves played. Scores are from the
+# side to move's point of view: positive wins, negative loses, 0 draws, and
+# the magnitude is larger the sooner the game is won.
+
+WIDTH = 7
+HEIGHT = 6
+CELLS = WIDTH * HEIGHT
+
+COLUMN_ORDER = [3, 2, 4, 1, 5, 0, 6]
+SOLVER_NODE_LIMIT = 100000
+# earlier than this the solver almost never finishes within SOLVER_NODE_LIMIT
+SOLVER_MIN_MOVES = 16
+# Mirror-image positions only meet in the opening; past this many moves
+# canonical keys cost time without saving any nodes.
+SYMMETRY_MAX_MOVES = 12
+
+def bottom_mask_col(col):
+    return 1 << (col * (HEIGHT + 1))
+
+def top_mask_col(col):
+    return 1 << (HEIGHT - 1 + col * (HEIGHT + 1))
+
+def column_mask(col):
+    return ((1 << HEIGHT) - 1) << (col * (HEIGHT + 1))
+
+BOTTOM_MASK = sum(bottom_mask_col(c) for c in range(WIDTH))
+BOARD_MASK = BOTTOM_MASK * ((1 << HEIGHT) - 1)
+COLUMN_MASKS = [column_mask(c) for c in range(WIDTH)]
+TOP_MASKS = [top_mask_col(c) for c in range(WIDTH)]
+BOTTOM_MASKS = [bottom_mask_col(c) for c in range(WIDTH)]
+
+def winning_positions(position, mask):
+    # empty cells that would complete four for the owner of position
+    h = HEIGHT
+    r = (position << 1) & (position << 2) & (position << 3)
+
+    for shift in (h + 1, h, h + 2):
+        p = (position << shift) & (position << 2 * shift)
+        r |= p & (position << 3 * shift)
+        r |= p & (position >> shift)
+        p = (position >> shift) & (position >> 2 * shift)
+        r |= p & (position << shift)
+        r |= p & (position >> 3 * shift)
+
+    return r & (BOARD_MASK ^ mask)
+
+def possible(mask):
+    return (mask + BOTTOM_MASK) & BOARD_MASK
+
+def can_win_next(current, mask):
+    return winning_positions(current, mask) & possible(mask) != 0
+
+def non_losing_moves(current, mask):
+    moves = possible(mask)
+    opponent_wins = winning_positions(current ^ mask, mask)
+    forced = moves & opponent_wins
+    if forced:
+        if forced & (forced - 1):
+            return 0
+        moves = forced
+    # never play directly below a square the opponent is waiting for
+    return moves & ~(opponent_wins >> 1)
+
+def position_key(current, mask):
+    return current + mask + BOTTOM_MASK
+
+COLUMN_BITS = (1 << (HEIGHT + 1)) - 1
+
+def mirror(bits):
+    # the same bitboard with the columns in reverse order; works on
+    # current, mask and position keys alike since each column's bits stay
+    # inside its own HEIGHT + 1 bit group
+    result = 0
+    for col in range(WIDTH):
+        result |= (bits >> col * (HEIGHT + 1) & COLUMN_BITS) << (WIDTH - 1 - col) * (HEIGHT + 1)
+    return result
+
+def canonical_key(key):
+    # a position and its mirror image have the same score, so tables and
+    # the book store only the smaller of the two keys
+    return min(key, mirror(key))
+
+def is_symmetric(current, mask):
+    return mirror(mask) == mask and mirror(current) == current
+
+def table_key(key):
+    # odd multiply and xorshift are both invertible, so distinct positions
+    # keep distinct keys while the low bits used for slots get mixed
+    key = (key * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+    return key ^ (key >> 29)
+
+def position_from_board(board, piece):
+    if isinstance(board, Board):
+        current = board.masks[piece - 1]
+        mask = board.masks[0] | board.masks[1]
+        return current, mask, board.moves
+    current = mask = moves = 0
+    for r in range(HEIGHT):
+        for c in range(WIDTH):
+            if board[r][c] != 0:
+                bit = 1 << (c * (HEIGHT + 1) + r)
+                mask |= bit
+                moves += 1
+                if board[r][c] == piece:
+                    current |= bit
+    return current, mask, moves
+
+def position_from_moves(moves):
+    current = mask = 0
+    for col in moves:
+        current ^= mask
+        mask |= mask + BOTTOM_MASKS[col]
+    return current, mask, len(moves)
+
+def popcount(x):
+    return bin(x).count("1")
+
+class Solver:
+    def __init__(self, tt_size_mb=64, book=None, node_limit=None, stop_event=None, deadline=None):
+        self.tt = TranspositionTable(tt_size_mb)
+        self.book = book
+        self.node_limit = node_limit
+        self.stop_event = stop_event
+        # time.time() after which the solve gives up
+        self.deadline = deadline
+        self.nodes = 0
+
+    def negamax(self, current, mask, moves, alpha, beta):
+        # assumes the side to move cannot win immediately
+        self.nodes += 1
+        if self.node_limit is not None and self.nodes > self.node_limit:
+            raise SearchTimeout()
+        if self.stop_event is not None and self.stop_event.is_set():
+            raise SearchTimeout()
+        if self.deadline is not None and time.time() > self.deadline:
+            raise SearchTimeout()
+
+        next_moves = non_losing_moves(current, mask)
+        if next_moves == 0:
+            return -((CELLS - moves) // 2)
+        if moves >= CELLS - 2:
+            return 0
+
+        low = -((CELLS - 2 - moves) // 2)
+        if alpha < low:
+            alpha = low
+            if alpha >= beta:
+                return alpha
+        high = (CELLS - 1 - moves) // 2
+        if beta > high:
+            beta = high
+            if alpha >= beta:
+                return beta
+
+        key = position_key(current, mask)
+        # positions early enough to meet their mirror share one entry
+        slot_key = table_key(canonical_key(key) if moves < SYMMETRY_MAX_MOVES else key)
+        entry = self.tt.probe(slot_key)
+        if entry is not None:
+            value, flag = entry[1], entry[2]
+            if flag == LOWER:
+                if alpha < value:
+                    alpha = value
+                    if alpha >= beta:
+                        return alpha
+            else:
+                if beta > value:
+                    beta = value
+                    if alpha >= beta:
+                        return beta
+
+        if self.book is not None:
+            score = self.book.score(key)
+            if score is not None:
+                return score
+
+        candidates = []
+        for col in COLUMN_ORDER:
+            move = next_moves & COLUMN_MASKS[col]
+            if move:
+                threats = popcount(winning_positions(current | move, mask))
+                candidates.append((threats, col, move))
+        # most new threats first, centre-first among equals (sort is stable)
+        candidates.sort(key=lambda candidate: -candidate[0])
+
+        for _, _, move in candidates:
+            score = -self.negamax(current ^ mask, mask | move, moves + 1, -beta, -alpha)
+            if score >= beta:
+                self.tt.store(slot_key, 0, score, LOWER, None)
+                return score
+            if score > alpha:
+                alpha = score
+
+        self.tt.store(slot_key, 0, alpha, UPPER, None)
+        return alpha
+
+    def solve(self, current, mask, moves):
+        if can_win_next(current, mask):
+            return (CELLS + 1 - moves) // 2
+        low = -((CELLS - moves) // 2)
+        high = (CELLS + 1 - moves) // 2
+        # narrow [low, high] with null-window searches
+        while low < high:
+            med = low + (high - low) // 2
+            if med <= 0 and int(low / 2) < med:
+                med = int(low / 2)
+            elif med >= 0 and int(high / 2) > med:
+                med = int(high / 2)
+            result = self.negamax(current, mask, moves, med, med + 1)
+            if result <= med:
+                high = result
+            else:
+                low = result
+        return low
+
+    def analyze(self, current, mask, moves):
+        scores = [None] * WIDTH
+        symmetric = is_symmetric(current, mask)
+        for col in range(WIDTH):
+            if mask & TOP_MASKS[col]:
+                continue
+            if symmetric and col > WIDTH - 1 - col:
+                scores[col] = scores[WIDTH - 1 - col]
+                continue
+            move = (mask + BOTTOM_MASKS[col]) & COLUMN_MASKS[col]
+            if winning_positions(current, mask) & move:
+                scores[col] = (CELLS + 1 - moves) // 2
+            else:
+                scores[col] = -self.solve(current ^ mask, mask | move, moves + 1)
+        return scores
+
+    def best_move(self, current, mask, moves):
+        if self.book is not None:
+            hit = self.book.lookup(position_key(current, mask))
+            if hit is not None:
+                return hit
+        scores = self.analyze(current, mask, moves)
+        best = None
+        for col in COLUMN_ORDER:
+            if scores[col] is not None and (best is None or scores[col] > scores[best]):
+                best = col
+        return best, scores[best] if best is not None else None
+
+def solve_board(board, piece, solver=None):
+    if solver is None:
+        solver = Solver()
+    return solver.best_move(*position_from_board(board, piece))
+
+def perfect_move(board, piece, book=None, node_limit=SOLVER_NODE_LIMIT, stop_event=None, deadline=None):
+    # book hit or exact solve, or None if the position is too deep to solve
+    # within node_limit or before deadline
+    current, mask, moves = position_from_board(board, piece)
+    if book is not None:
+        hit = book.lookup(position_key(current, mask))
+        if hit is not None:
+            return hit
+    if moves < SOLVER_MIN_MOVES:
+        return None
+    solver = Solver(tt_size_mb=8, book=book, node_limit=node_limit, stop_event=stop_event, deadline=deadline)
+    try:
+        col, score = solver.best_move(current, mask, moves)
+    except SearchTimeout:
+        return None
+    if col is None:
+        return None
+    return col, score
@@ -0,0 +1,55 @@
+import random
+import unittest
+
+from bitboard import Board
+from board import create_board, drop_piece, get_next_open_row, is_valid_location, winning_move, winning_move_at
+
+# (rows, cols, k) the win checks are compared on
+WIN_SHAPES = ((6, 7, 4), (4, 4, 3), (5, 5, 3), (6, 7, 2), (7, 8, 5), (8, 9, 5), (9, 7, 6))
+
+class WinningMoveAtTest(unittest.TestCase):
+    def test_matches_full_board_scan_after_every_move(self):
+        # random games on a list board and a Board side by side; until the
+        # first win, the check through the last piece must agree with a
+        # scan of the whole board on both representations
+        rng = random.Random(17)
+        for rows, cols, k in WIN_SHAPES:
+            wins = 0
+            for _ in range(150):
+                boards = (create_board(rows, cols), Board(rows, cols))
+                piece = 1
+                moves = []
+                for _ in range(rows * cols):
+                    col = rng.choice([c for c in range(cols) if is_valid_location(boards[0], c)])
+                    row = get_next_open_row(boards[0], col)
+                    moves.append(col)
+                    for board in boards:
+                        self.assertEqual(get_next_open_row(board, col), row)
+                        drop_piece(board, row, col, piece)
+                    results = set()
+                    for board in boards:
+                        at = winning_move_at(board, row, col, piece, k)
+                        self.assertEqual(at, winning_move(board, piece, k), f"{type(board).__name__} {rows}x{cols} k={k} moves {moves}")
+                        # the other side's last move didn't win, so it still hasn't
+                        self.assertFalse(winning_move(board, 3 - piece, k))
+                        results.add(at)
+                    self.assertEqual(len(results), 1, f"list board and Board disagree: {rows}x{cols} k={k} moves {moves}")
+                    if results.pop():
+                        wins += 1
+                        break
+                    piece = 3 - piece
+            # the corpus should exercise wins, not just quiet positions
+            self.assertGreater(wins, 0)
+
+    def test_empty_cell_and_other_piece_never_win(self):
+        board = create_board()
+        for col in (0, 0, 0, 0):
+            drop_piece(board, get_next_open_row(board, col), col, 1)
+        bitboard = Board.from_list(board)
+        for b in (board, bitboard):
+            self.assertTrue(winning_move_at(b, 3, 0, 1))
+            self.assertFalse(winning_move_at(b, 3, 0, 2))
+            self.assertFalse(winning_move_at(b, 4, 0, 1))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+import math
+import random
+import time
+import unittest
+
+from board import create_board, drop_piece, get_next_open_row, is_valid_location, remove_piece
+from evaluator import IncrementalEvaluator
+from minimaxAI import evaluate_position, minimax
+
+# (column, score) from minimax for the side to move after each move string,
+# searched with the full window and no time limit. The original and
+# heuristic2 rows are the results of the implementation before the search
+# was made in place; heuristic1's come from its bitboard rebuild, which
+# scores positions differently on purpose.
+SEARCH_EXPECTED = {
+    "0": {
+        "original": {2: (3, -3), 4: (3, -2), 6: (3, -10)},
+        "heuristic1": {2: (3, -40), 4: (3, -40), 6: (3, -10)},
+        "heuristic2": {2: (0, -6), 4: (3, -6), 6: (3, -3)},
+    },
+    "26": {
+        "original": {2: (3, 21), 4: (3, 23), 6: (3, 27)},
+        "heuristic1": {2: (3, 80), 4: (3, 190), 6: (3, 190)},
+        "heuristic2": {2: (2, -1), 4: (2, 2), 6: (3, 4)},
+    },
+    "56562": {
+        "original": {2: (6, -134), 4: (4, -150), 6: (3, -196)},
+        "heuristic1": {2: (6, -340), 4: (3, -210), 6: (4, -610)},
+        "heuristic2": {2: (5, -8), 4: (6, -8), 6: (3, -11)},
+    },
+    "41404513": {
+        "original": {2: (4, 1000000), 4: (4, 1000000), 6: (4, 1000000)},
+        "heuristic1": {2: (4, 1000000), 4: (4, 1000000), 6: (4, 1000000)},
+        "heuristic2": {2: (4, 1000000), 4: (4, 1000000), 6: (4, 1000000)},
+    },
+    "656424342060": {
+        "original": {2: (6, 1000000), 4: (6, 1000000), 6: (6, 1000000)},
+        "heuristic1": {2: (6, 1000000), 4: (6, 1000000), 6: (6, 1000000)},
+        "heuristic2": {2: (6, 1000000), 4: (6, 1000000), 6: (6, 1000000)},
+    },
+    "32334141110": {
+        "original": {2: (2, -141), 4: (2, -147), 6: (2, -325)},
+        "heuristic1": {2: (2, -89170), 4: (2, -89200), 6: (6, -90330)},
+        "heuristic2": {2: (3, -3), 4: (3, -4), 6: (2, -13)},
+    },
+    "21144": {
+        "original": {2: (2, -17), 4: (2, -62), 6: (2, -141)},
+        "heuristic1": {2: (2, -200), 4: (2, -260), 6: (2, -280)},
+        "heuristic2": {2: (4, -10), 4: (1, -10), 6: (4, -10)},
+    },
+    "45413635462": {
+        "original": {2: (4, -500), 4: (4, -843), 6: (0, -1000000)},
+        "heuristic1": {2: (4, -90970), 4: (4, -581970), 6: (0, -1000000)},
+        "heuristic2": {2: (4, -27), 4: (4, -29), 6: (0, -1000000)},
+    },
+    "3234466": {
+        "original": {2: (2, -449), 4: (2, -449), 6: (3, -632)},
+        "heuristic1": {2: (3, -90150), 4: (3, -90370), 6: (3, -90370)},
+        "heuristic2": {2: (3, -16), 4: (3, -16), 6: (3, -14)},
+    },
+    "53324545335": {
+        "original": {2: (4, -235), 4: (4, -229), 6: (1, -113)},
+        "heuristic1": {2: (4, -40), 4: (4, -70), 6: (4, -120)},
+        "heuristic2": {2: (4, -9), 4: (4, 0), 6: (1, 1)},
+    },
+}
+
+def play_moves(moves):
+    # the 6x7 board after a string of column digits, and the side to move
+    board = create_board()
+    piece = 1
+    for char in moves:
+        col = int(char)
+        drop_piece(board, get_next_open_row(board, col), col, piece)
+        piece = 3 - piece
+    return board, piece
+
+class MinimaxBaselineTest(unittest.TestCase):
+    def test_columns_and_scores_match_baseline(self):
+        for moves, heuristics in SEARCH_EXPECTED.items():
+            board, piece = play_moves(moves)
+            before = [row[:] for row in board]
+            for heuristic_type, results in heuristics.items():
+                for depth, expected in results.items():
+                    with self.subTest(moves=moves, heuristic=heuristic_type, depth=depth):
+                        result = minimax(board, depth, -math.inf, math.inf, True, piece, time.time(), math.inf, heuristic_type)
+                        self.assertEqual(result, expected)
+                        # the search plays and takes back moves on the board it is given
+                        self.assertEqual(board, before)
+
+# (rows, cols, k) the incremental evaluator is checked on
+EVALUATOR_SHAPES = ((6, 7, 4), (5, 5, 3), (8, 9, 5), (6, 7, 2))
+
+def random_board(rng, rows, cols):
+    # a random position reached by legal moves; wins are not checked, the
+    # evaluators score any position
+    board = create_board(rows, cols)
+    piece = 1
+    for _ in range(rng.randrange(rows * cols + 1)):
+        col = rng.choice([c for c in range(cols) if is_valid_location(board, c)])
+        drop_piece(board, get_next_open_row(board, col), col, piece)
+        piece = 3 - piece
+    return board
+
+class IncrementalEvaluatorTest(unittest.TestCase):
+    def test_scores_from_scratch_match_evaluate_position(self):
+        rng = random.Random(5)
+        for rows, cols, k in EVALUATOR_SHAPES:
+            for _ in range(300):
+                board = random_board(rng, rows, cols)
+                for piece in (1, 2):
+                    with self.subTest(rows=rows, cols=cols, k=k, board=board, piece=piece):
+                        self.assertEqual(IncrementalEvaluator(board, piece, k).score(), evaluate_position(board, piece, k))
+
+    def test_play_and_undo_track_evaluate_position(self):
+        # random walks that drop and take back pieces, as the search does
+        rng = random.Random(6)
+        for rows, cols, k in EVALUATOR_SHAPES:
+            for _ in range(20):
+                board = create_board(rows, cols)
+                piece = rng.choice((1, 2))
+                evaluator = IncrementalEvaluator(board, piece, k)
+                played = []
+                for _ in range(200):
+                    open_cols = [c for c in range(cols) if is_valid_location(board, c)]
+                    if played and (not open_cols or rng.random() < 0.4):
+                        row, col, mover = played.pop()
+                        remove_piece(board, row, col)
+                        evaluator.remove(row, col, mover)
+                    else:
+                        col = rng.choice(open_cols)
+                        row = get_next_open_row(board, col)
+                        mover = 1 if len(played) % 2 == 0 else 2
+                        drop_piece(board, row, col, mover)
+                        evaluator.add(row, col, mover)
+                        played.append((row, col, mover))
+                    self.assertEqual(evaluator.score(), evaluate_position(board, piece, k),
+                                     f"{rows}x{cols} k={k} after {played}")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+from itertools import compress
+
+from bitboard import Board
+from windows import PIECE_SELECTORS, flat_board
+
+# Threat analysis on bitboards. A threat is an empty cell that would complete
+# k in a row for one player. Every result is a mask in the Board layout (cell
+# (row, col) at bit col * (rows + 1) + row), so each question below is a few
+# shifts and ands over the whole board instead of a walk over every window.
+#
+# Rows are counted from 1 at the bottom for parity, as in the usual
+# zugzwang rule: when the board fills up, the first player gets the odd rows
+# and the second player the even ones, so a threat on a row of the owner's
+# parity tends to be cashed in at the end while one on the other parity is
+# usually killed off.
+
+_geometry = {}
+
+def geometry(rows, cols):
+    # (bottom row, board, odd rows) masks for a rows x cols board
+    masks = _geometry.get((rows, cols))
+    if masks is None:
+        stride = rows + 1
+        bottom = sum(1 << (c * stride) for c in range(cols))
+        board = bottom * ((1 << rows) - 1)
+        odd = sum(1 << (c * stride + r) for c in range(cols) for r in range(0, rows, 2))
+        masks = (bottom, board, odd)
+        _geometry[(rows, cols)] = masks
+    return masks
+
+_cell_bits = {}
+
+def cell_bits(rows, cols):
+    # bitboard bit of each cell, in windows.flat_board order
+    bits = _cell_bits.get((rows, cols))
+    if bits is None:
+        bits = tuple(1 << (c * (rows + 1) + r) for r in range(rows) for c in range(cols))
+        _cell_bits[(rows, cols)] = bits
+    return bits
+
+def board_masks(board):
+    # (player 1 mask, player 2 mask) of a Board or a nested list board
+    if isinstance(board, Board):
+        return board.masks[0], board.masks[1]
+    bits = cell_bits(len(board), len(board[0]))
+    flat = flat_board(board)
+    return (sum(compress(bits, flat.translate(PIECE_SELECTORS[1]))),
+            sum(compress(bits, flat.translate(PIECE_SELECTORS[2]))))
+
+def threat_squares(position, occupied, rows, cols, k=4):
+    # empty cells that complete k in a row for the owner of position; only
+    # shifts and bitwise ops, so it also runs on NumPy uint64 arrays of masks
+    stride = rows + 1
+    full = geometry(rows, cols)[1]
+    if k == 4:
+        # unrolled, as in solver.winning_positions
+        threats = (position << 1) & (position << 2) & (position << 3)
+        for shift in (stride, stride + 1, stride - 1):
+            pair = (position << shift) & (position << 2 * shift)
+            threats |= pair & (position << 3 * shift)
+            threats |= pair & (position >> shift)
+            pair = (position >> shift) & (position >> 2 * shift)
+            threats |= pair & (position << shift)
+            threats |= pair & (position >> 3 * shift)
+        return threats & full & ~occupied
+    threats = position & 0
+    for shift in (1, stride, stride + 1, stride - 1):
+        # below[n] / above[n]: the n cells back / forward along the line are
+        # all the owner's
+        below = [full]
+        above = [full]
+        for i in range(1, k):
+            below.append(below[-1] & (position << (i * shift)))
+            above.append(above[-1] & (position >> (i * shift)))
+        for n in range(k):
+            threats |= below[n] & above[k - 1 - n]
+    return threats & full & ~occupied
+
+def cells(mask, rows):
+    # (row, col) of every set bit, bottom to top within each column
+    stride = rows + 1
+    found = []
+    while mask:
+        low = mask & -mask
+        bit = low.bit_length() - 1
+        found.append((bit % stride, bit // stride))
+        mask ^= low
+    return found
+
+def popcount(mask):
+    return bin(mask).count("1")
+
+class ThreatAnalysis:
+    # Every attribute except playable is a dict keyed by piece (1 or 2):
+    #   threats   empty cells that complete a line
+    #   immediate threats that can be played right now
+    #   odd/even  threats on odd or even rows (counted from 1)
+    #   good      threats on the owner's zugzwang parity (odd for 1, even for 2)
+    #   stacked   threats with another of the owner's threats directly on top;
+    #             once the lower one is playable the opponent cannot stop both
+    #   poisoned  empty cells directly below the opponent's threats, where
+    #             playing hands the opponent the threat
+    def __init__(self, board, k=4):
+        self.rows = len(board)
+        self.cols = len(board[0])
+        self.k = k
+        self.masks = dict(zip((1, 2), board_masks(board)))
+        bottom, full, odd = geometry(self.rows, self.cols)
+        occupied = self.masks[1] | self.masks[2]
+        self.playable = (occupied + bottom) & full
+        empty = full & ~occupied
+
+        self.threats = {piece: threat_squares(self.masks[piece], occupied, self.rows, self.cols, k) for piece in (1, 2)}
+        self.immediate = {}
+        self.odd = {}
+        self.even = {}
+        self.good = {}
+        self.stacked = {}
+        self.poisoned = {}
+        for piece in (1, 2):
+            threats = self.threats[piece]
+            self.immediate[piece] = threats & self.playable
+            self.odd[piece] = threats & odd
+            self.even[piece] = threats & ~odd
+            self.good[piece] = self.odd[piece] if piece == 1 else self.even[piece]
+            self.stacked[piece] = threats & (threats >> 1)
+            self.poisoned[3 - piece] = (threats >> 1) & empty
+
+    def count(self, name, piece):
+        return popcount(getattr(self, name)[piece])
+
+    def cells(self, name, piece):
+        return cells(getattr(self, name)[piece], self.rows)
+
+    def unstoppable(self, piece):
+        # two threats the opponent can't both block with one move, either
+        # side by side on the playable row or stacked on a playable one
+        return popcount(self.immediate[piece]) > 1 or self.stacked[piece] & self.playable != 0
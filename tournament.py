@@ -0,0 +1,203 @@
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from board import create_board, drop_piece, get_next_open_row, is_valid_location, winning_move_at
+from evalcache import EvalCache
+from gamerecord import GameWriter
+from minimaxAI import iterative_deepening
+from transposition import TranspositionTable
+
+HEURISTICS = ("original", "heuristic1", "heuristic2")
+# table and evaluation cache sizes for each player in each game
+PLAYER_TT_MB = 16
+PLAYER_EVAL_CACHE_MB = 16
+# 95% confidence
+Z_SCORE = 1.96
+
+class PlayerConfig:
+    # "heuristic:depth" or "heuristic:depth:seconds", e.g. "heuristic2:6:0.5"
+    def __init__(self, heuristic_type, depth, time_limit=None):
+        self.heuristic_type = heuristic_type
+        self.depth = depth
+        self.time_limit = time_limit
+
+    @classmethod
+    def parse(cls, spec):
+        parts = spec.split(":")
+        if len(parts) not in (2, 3):
+            raise ValueError(f"bad player spec {spec!r}, expected heuristic:depth[:seconds]")
+        if parts[0] not in HEURISTICS:
+            raise ValueError(f"unknown heuristic {parts[0]!r} in {spec!r}, expected one of {', '.join(HEURISTICS)}")
+        try:
+            depth = int(parts[1])
+            time_limit = float(parts[2]) if len(parts) == 3 else None
+        except ValueError:
+            raise ValueError(f"bad player spec {spec!r}, depth and seconds must be numbers")
+        if depth < 1:
+            raise ValueError(f"bad player spec {spec!r}, depth must be at least 1")
+        if time_limit is not None and not time_limit > 0:
+            raise ValueError(f"bad player spec {spec!r}, seconds must be more than 0")
+        return cls(parts[0], depth, time_limit)
+
+    @property
+    def name(self):
+        name = f"{self.heuristic_type}:{self.depth}"
+        if self.time_limit is not None:
+            name += f":{self.time_limit:g}"
+        return name
+
+    def move(self, board, piece, k=4, tt=None, eval_cache=None):
+        col, _ = iterative_deepening(board, piece, self.depth, time_limit=self.time_limit, heuristic_type=self.heuristic_type, tt=tt, k=k,
+                                     eval_cache=eval_cache)
+        return col
+
+def random_opening(plies, rng, rows=6, cols=7, k=4):
+    # random moves that never complete a line, so every opening is still open
+    while True:
+        board = create_board(rows, cols)
+        moves = []
+        piece = 1
+        for _ in range(plies):
+            choices = [c for c in range(cols) if is_valid_location(board, c)]
+            col = rng.choice(choices)
+            row = get_next_open_row(board, col)
+            drop_piece(board, row, col, piece)
+            if winning_move_at(board, row, col, piece, k):
+                break
+            moves.append(col)
+            piece = 3 - piece
+        if len(moves) == plies:
+            return moves
+
+def play_game(first, second, opening, rows=6, cols=7, k=4):
+    # returns the winning side (0 for a draw) and every move of the game
+    board = create_board(rows, cols)
+    players = {1: first, 2: second}
+    # Each player keeps a table and evaluation cache for the whole game, new
+    # for every game, so no game depends on what its worker played before.
+    tables = {piece: (TranspositionTable(PLAYER_TT_MB), EvalCache(size_mb=PLAYER_EVAL_CACHE_MB)) for piece in players}
+    moves = list(opening)
+    piece = 1
+    for col in opening:
+        drop_piece(board, get_next_open_row(board, col), col, piece)
+        piece = 3 - piece
+    for _ in range(rows * cols - len(opening)):
+        tt, eval_cache = tables[piece]
+        col = players[piece].move(board, piece, k, tt, eval_cache)
+        row = get_next_open_row(board, col)
+        drop_piece(board, row, col, piece)
+        moves.append(col)
+        if winning_move_at(board, row, col, piece, k):
+            return piece, moves
+        piece = 3 - piece
+    return 0, moves
+
+def play_pair(a, b, opening, rows=6, cols=7, k=4):
+    # the same opening with both colour assignments, scored for a
+    results = []
+    games = []
+    for first, second, a_piece in ((a, b, 1), (b, a, 2)):
+        winner, moves = play_game(first, second, opening, rows, cols, k)
+        results.append(0.5 if winner == 0 else float(winner == a_piece))
+        games.append((moves, winner, {"first": first.name, "second": second.name}))
+    return results, games
+
+def elo_difference(score):
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return -400 * math.log10(1 / score - 1)
+
+def elo_estimate(wins, draws, losses):
+    # Elo from the mean game score; interval from the per-game score variance
+    games = wins + draws + losses
+    if games == 0:
+        return 0.0, -math.inf, math.inf
+    score = (wins + 0.5 * draws) / games
+    variance = (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score ** 2) / games
+    margin = Z_SCORE * math.sqrt(variance / games)
+    return elo_difference(score), elo_difference(score - margin), elo_difference(score + margin)
+
+def run_tournament(specs, pairs_per_match, opening_plies=2, seed=0, workers=None, rows=6, cols=7, k=4, record=None):
+    players = [PlayerConfig.parse(spec) for spec in specs]
+    rng = random.Random(seed)
+    openings = [random_opening(opening_plies, rng, rows, cols, k) for _ in range(pairs_per_match)]
+
+    matches = {}
+    writer = GameWriter(record, rows, cols, k) if record else None
+    with ProcessPoolExecutor(workers or os.cpu_count() or 1) as executor:
+        for a, b in itertools.combinations(players, 2):
+            matches[(a.name, b.name)] = [executor.submit(play_pair, a, b, opening, rows, cols, k) for opening in openings]
+        table = []
+        for (a, b), futures in matches.items():
+            scores = []
+            for future in futures:
+                pair_scores, games = future.result()
+                scores += pair_scores
+                if writer is not None:
+                    for moves, winner, tags in games:
+                        writer.write_game(moves, winner, tags)
+            wins = scores.count(1.0)
+            draws = scores.count(0.5)
+            losses = scores.count(0.0)
+            elo, low, high = elo_estimate(wins, draws, losses)
+            table.append({"player": a, "opponent": b, "wins": wins, "draws": draws, "losses": losses,
+                          "elo": elo, "elo_low": low, "elo_high": high})
+    if writer is not None:
+        writer.close()
+    return table
+
+def print_table(table):
+    print(f'{"player":<20} {"opponent":<20} {"W":>5} {"D":>5} {"L":>5}  {"Elo":>7}  95% interval')
+    for row in table:
+        print(f'{row["player"]:<20} {row["opponent"]:<20} {row["wins"]:>5} {row["draws"]:>5} {row["losses"]:>5}'
+              f'  {row["elo"]:>+7.0f}  [{row["elo_low"]:+.0f}, {row["elo_high"]:+.0f}]')
+
+    totals = {}
+    for row in table:
+        for name, w, l in ((row["player"], row["wins"], row["losses"]), (row["opponent"], row["losses"], row["wins"])):
+            total = totals.setdefault(name, [0, 0, 0])
+            total[0] += w
+            total[1] += row["draws"]
+            total[2] += l
+    print()
+    print(f'{"standings":<20} {"W":>5} {"D":>5} {"L":>5}  {"score":>6}')
+    for name, (w, d, l) in sorted(totals.items(), key=lambda item: -(item[1][0] + 0.5 * item[1][1]) / sum(item[1])):
+        print(f'{name:<20} {w:>5} {d:>5} {l:>5}  {(w + 0.5 * d) / (w + d + l):>6.1%}')
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless AI vs AI tournament")
+    parser.add_argument("players", nargs="+", help="heuristic:depth[:seconds], e.g. heuristic1:4 heuristic2:4")
+    parser.add_argument("--games", type=int, default=100, help="games per pairing, played as colour-swapped pairs")
+    parser.add_argument("--opening-plies", type=int, default=2, help="random moves played before the engines take over")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", default=None, help="also write the table as JSON")
+    parser.add_argument("--rows", type=int, default=6)
+    parser.add_argument("--cols", type=int, default=7)
+    parser.add_argument("--connect", type=int, default=4, help="pieces in a row needed to win")
+    parser.add_argument("--record", default=None, help="append every game to this game record file")
+    args = parser.parse_args()
+    if len(args.players) < 2:
+        parser.error("need at least two players")
+    for spec in args.players:
+        try:
+            PlayerConfig.parse(spec)
+        except ValueError as e:
+            parser.error(str(e))
+
+    start = time.time()
+    table = run_tournament(args.players, (args.games + 1) // 2, args.opening_plies, args.seed, args.workers,
+                           args.rows, args.cols, args.connect, args.record)
+    print_table(table)
+    print(f"\n{time.time() - start:.1f} s")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(table, f, indent=2)
+
+if __name__ == "__main__":
+    main()
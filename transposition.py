@@ -0,0 +1,154 @@
+import random
+from array import array
+
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+# key, value, depth, flag, move and generation live in parallel typed arrays
+ENTRY_BYTES = 8 + 8 + 1 + 1 + 1 + 1
+
+_rng = random.Random(0xC4)
+_zobrist_tables = {}
+_paired_tables = {}
+
+HEURISTIC_KEYS = {name: _rng.getrandbits(64) for name in ("original", "heuristic1", "heuristic2")}
+PIECE_KEYS = {1: _rng.getrandbits(64), 2: _rng.getrandbits(64)}
+SIDE_KEY = _rng.getrandbits(64)
+
+def zobrist_table(rows, cols):
+    table = _zobrist_tables.get((rows, cols))
+    if table is None:
+        rng = random.Random(rows * 1000 + cols)
+        table = [[(0, rng.getrandbits(64), rng.getrandbits(64)) for _ in range(cols)] for _ in range(rows)]
+        _zobrist_tables[(rows, cols)] = table
+    return table
+
+# Mirror symmetry. A position and its left-right mirror have the same value
+# under any evaluation that treats column c and column cols-1-c alike, so they
+# can share one table entry. For those heuristics the key is 128 bits: the
+# usual hash in the low half and the hash of the mirrored board in the high
+# half, kept up to date by the same single xor per move. The table is probed
+# with the smaller half and moves are flipped when the mirror was used.
+HASH_MASK = (1 << 64) - 1
+
+def paired(key):
+    return key | key << 64
+
+def symmetric_heuristic(heuristic_type, cols):
+    # "original" only has a single centre column on odd widths
+    if heuristic_type in ("heuristic1", "heuristic2"):
+        return True
+    return heuristic_type == "original" and cols % 2 == 1
+
+def paired_zobrist_table(rows, cols):
+    table = _paired_tables.get((rows, cols))
+    if table is None:
+        base = zobrist_table(rows, cols)
+        table = [[(0, base[r][c][1] | base[r][cols-1-c][1] << 64, base[r][c][2] | base[r][cols-1-c][2] << 64)
+                  for c in range(cols)] for r in range(rows)]
+        _paired_tables[(rows, cols)] = table
+    return table
+
+def key_tables(rows, cols, heuristic_type):
+    # the zobrist table and side-to-move key that search keys are updated with
+    if symmetric_heuristic(heuristic_type, cols):
+        return paired_zobrist_table(rows, cols), paired(SIDE_KEY)
+    return zobrist_table(rows, cols), SIDE_KEY
+
+def zobrist_hash(board, table=None):
+    rows = len(board)
+    cols = len(board[0])
+    if table is None:
+        table = zobrist_table(rows, cols)
+    key = 0
+    for r in range(rows):
+        for c in range(cols):
+            if board[r][c]:
+                key ^= table[r][c][board[r][c]]
+    return key
+
+def search_key(board, piece, maximizingPlayer, heuristic_type):
+    table, side_key = key_tables(len(board), len(board[0]), heuristic_type)
+    salt = HEURISTIC_KEYS[heuristic_type] ^ PIECE_KEYS[piece]
+    if symmetric_heuristic(heuristic_type, len(board[0])):
+        salt = paired(salt)
+    key = zobrist_hash(board, table) ^ salt
+    if not maximizingPlayer:
+        key ^= side_key
+    return key
+
+def canonical_key(key):
+    # (table key, whether it is the mirrored position's); plain 64-bit keys
+    # pass through unchanged
+    mirror = key >> 64
+    if mirror and mirror < key & HASH_MASK:
+        return mirror, True
+    return key & HASH_MASK, False
+
+def is_symmetric_key(key):
+    # a paired key whose halves agree belongs to a position equal to its mirror
+    return key >> 64 == key & HASH_MASK
+
+class TranspositionTable:
+    def __init__(self, size_mb=16):
+        slots = 1
+        while slots * 2 * ENTRY_BYTES <= size_mb * 1024 * 1024:
+            slots *= 2
+        self.size = slots
+        self.mask = slots - 1
+        self.keys = array('Q', bytes(8 * slots))
+        self.values = array('q', bytes(8 * slots))
+        self.depths = array('b', [-1]) * slots
+        self.flags = array('b', bytes(slots))
+        self.moves = array('b', [-1]) * slots
+        self.generations = array('B', bytes(slots))
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self.stores = 0
+
+    def clear(self):
+        self.keys = array('Q', bytes(8 * self.size))
+        self.depths = array('b', [-1]) * self.size
+        self.moves = array('b', [-1]) * self.size
+        self.hits = self.misses = self.collisions = self.stores = 0
+
+    def new_search(self):
+        # Entries stored before this are replaced whatever their depth, so a
+        # table kept across searches doesn't fill up with old deep entries.
+        self.generation = (self.generation + 1) & 0xFF
+
+    def probe(self, key):
+        slot = key & self.mask
+        if self.keys[slot] == key and self.depths[slot] >= 0:
+            self.hits += 1
+            move = self.moves[slot]
+            return self.depths[slot], self.values[slot], self.flags[slot], (None if move < 0 else move)
+        self.misses += 1
+        if self.depths[slot] >= 0:
+            self.collisions += 1
+        return None
+
+    def store(self, key, depth, value, flag, move):
+        slot = key & self.mask
+        if self.depths[slot] > depth and self.generations[slot] == self.generation:
+            return
+        self.keys[slot] = key
+        self.values[slot] = value
+        self.depths[slot] = depth
+        self.flags[slot] = flag
+        self.moves[slot] = -1 if move is None else move
+        self.generations[slot] = self.generation
+        self.stores += 1
+
+    def stats(self):
+        probes = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "collisions": self.collisions,
+            "stores": self.stores,
+            "hit_rate": self.hits / probes if probes else 0.0,
+        }
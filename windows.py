@@ -0,0 +1,78 @@
+HORIZONTAL = "horizontal"
+VERTICAL = "vertical"
+DIAGONAL_POS = "diagonal_pos"
+DIAGONAL_NEG = "diagonal_neg"
+
+_tables = {}
+
+class WindowTable:
+    def __init__(self, rows, cols, k=4):
+        self.rows = rows
+        self.cols = cols
+        self.k = k
+        self.windows = []
+        self.directions = []
+
+        # same order as the loops in evaluate_position
+        for r in range(rows):
+            for c in range(cols - k + 1):
+                self.add(tuple((r, c + i) for i in range(k)), HORIZONTAL)
+        for c in range(cols):
+            for r in range(rows - k + 1):
+                self.add(tuple((r + i, c) for i in range(k)), VERTICAL)
+        for r in range(rows - k + 1):
+            for c in range(cols - k + 1):
+                self.add(tuple((r + i, c + i) for i in range(k)), DIAGONAL_POS)
+        for r in range(k - 1, rows):
+            for c in range(cols - k + 1):
+                self.add(tuple((r - i, c + i) for i in range(k)), DIAGONAL_NEG)
+
+        cell_windows = [[[] for _ in range(cols)] for _ in range(rows)]
+        for index, window in enumerate(self.windows):
+            for r, c in window:
+                cell_windows[r][c].append(index)
+        self.cell_windows = [[tuple(indices) for indices in row] for row in cell_windows]
+        # windows through each cell; for 6x7 connect four this is the
+        # classic heuristic2 value matrix
+        self.value_matrix = [[len(indices) for indices in row] for row in cell_windows]
+
+        # The same tables over flat cell indices r * cols + c, for code that
+        # reads a flat_board instead of nested lists
+        self.flat_windows = tuple(tuple(r * cols + c for r, c in window) for window in self.windows)
+        self.flat_values = tuple(value for row in self.value_matrix for value in row)
+        self.column_windows = tuple(tuple(index for index, window in enumerate(self.windows)
+                                          if self.directions[index] == VERTICAL and window[0][1] == c)
+                                    for c in range(cols))
+
+    def add(self, window, direction):
+        self.windows.append(window)
+        self.directions.append(direction)
+
+def window_table(rows=6, cols=7, k=4):
+    table = _tables.get((rows, cols, k))
+    if table is None:
+        table = WindowTable(rows, cols, k)
+        _tables[(rows, cols, k)] = table
+    return table
+
+def flat_board(board):
+    # row-major bytes of the cells, one byte per cell
+    return b"".join(map(bytes, board))
+
+# translate tables that keep one player's cells as 1 and clear the rest
+PIECE_SELECTORS = {piece: bytes(int(value == piece) for value in range(256)) for piece in (1, 2)}
+
+_code_tables = {}
+
+def window_codes(flat, piece, k=4):
+    # The flat board recoded so that the sum of a window's cells is
+    # own + (k + 1) * opp: piece's cells become 1 and the opponent's k + 1.
+    # A window's piece counts then come from k byte reads and one lookup.
+    table = _code_tables.get((piece, k))
+    if table is None:
+        codes = bytearray(range(256))
+        codes[piece] = 1
+        codes[2 if piece == 1 else 1] = k + 1
+        table = bytes(codes)
+        _code_tables[(piece, k)] = table
+    return flat.translate(table)